@@ -0,0 +1,72 @@
+"""Benchmark of `boxes.Boxes` operations on detector-like outputs.
+
+Run from the repository root with ``python -m benchmarks.boxes``.
+"""
+
+import timeit
+
+import cv2
+import numpy as np
+
+from somepytools.boxes import Boxes
+
+# (number of boxes, number of objects they are clustered around, range of object sizes):
+# clusters, dense random boxes and sparse small boxes (most of them are kept by NMS)
+CASES = [
+    (10_000, 50, (40, 200)),
+    (100_000, 200, (40, 200)),
+    (100_000, 1000, (40, 200)),
+    (20_000, 20_000, (40, 200)),
+    (20_000, 20_000, (4, 12)),
+]
+FRAME = (1080, 1920)
+
+
+def make_boxes(
+    n_boxes: int, n_objects: int, size_range: tuple[float, float] = (40, 200)
+) -> tuple[Boxes, np.ndarray]:
+    """Returns 'cxcywh' boxes jittered around objects and their scores."""
+    rng = np.random.default_rng(0)
+    centers = rng.uniform(0, FRAME[::-1], (n_objects, 2))
+    sizes = rng.uniform(*size_range, (n_objects, 2))
+    which = rng.integers(0, n_objects, n_boxes)
+    data = np.concatenate(
+        [
+            centers[which] + rng.normal(0, 8, (n_boxes, 2)),
+            sizes[which] * rng.uniform(0.8, 1.2, (n_boxes, 2)),
+        ],
+        axis=1,
+    )
+    return Boxes(data, "cxcywh"), rng.uniform(0, 1, n_boxes)
+
+
+def loop_convert(boxes: Boxes) -> list:
+    return [(x - w / 2, y - h / 2, x + w / 2, y + h / 2) for x, y, w, h in boxes.data]
+
+
+def post_process(boxes: Boxes) -> Boxes:
+    return boxes.convert("tlbr").clip(*FRAME).rescale(FRAME, (540, 960))
+
+
+def opencv_nms(boxes: Boxes, scores: np.ndarray) -> np.ndarray:
+    return cv2.dnn.NMSBoxes(boxes.convert("xywh").data, scores.astype(np.float32), 0, 0.5)
+
+
+def best_ms(func, *args, number: int = 3) -> float:
+    return min(timeit.repeat(lambda: func(*args), number=number, repeat=3)) / number * 1e3
+
+
+def main():
+    for n_boxes, n_objects, size_range in CASES:
+        boxes, scores = make_boxes(n_boxes, n_objects, size_range)
+        print(f"{n_boxes} boxes around {n_objects} objects of {size_range} sizes")
+        print(f"  loop convert            {best_ms(loop_convert, boxes):>8.1f} ms")
+        print(f"  convert, clip, rescale  {best_ms(post_process, boxes):>8.1f} ms")
+        nms_ms = best_ms(boxes.nms, scores, number=1)
+        print(f"  nms                     {nms_ms:>8.1f} ms")
+        opencv_ms = best_ms(opencv_nms, boxes, scores, number=1)
+        print(f"  cv2.dnn.NMSBoxes        {opencv_ms:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
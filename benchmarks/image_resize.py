@@ -0,0 +1,44 @@
+"""Benchmark of `image.resize_batch` against a Python loop over `image.resize`.
+
+Run from the repository root with ``python -m benchmarks.image_resize``.
+"""
+
+import timeit
+
+import numpy as np
+
+from somepytools import image
+
+# (number of images, source height, source width)
+CASES = [(512, 240, 320), (128, 720, 1280)]
+TARGET = {"height": 224, "width": 224}
+
+
+def loop(images: list) -> np.ndarray:
+    return np.stack([image.resize(item, **TARGET) for item in images])
+
+
+def batch(images: list, out: np.ndarray, workers: int) -> np.ndarray:
+    return image.resize_batch(images, **TARGET, out=out, workers=workers)
+
+
+def best_ms(func, *args, number: int = 3) -> float:
+    return min(timeit.repeat(lambda: func(*args), number=number, repeat=3)) / number * 1e3
+
+
+def main():
+    rng = np.random.default_rng(0)
+    for n_images, height, width in CASES:
+        shape = (height, width, 3)
+        images = [rng.integers(0, 255, shape, dtype=np.uint8) for _ in range(n_images)]
+        print(f"{n_images} images {height}x{width} -> {TARGET['height']}x{TARGET['width']}")
+        print(f"  loop over resize         {best_ms(loop, images):>8.1f} ms")
+
+        out = image.resize_batch(images, **TARGET)
+        for workers in (1, 4, 8):
+            batch_ms = best_ms(batch, images, out, workers)
+            print(f"  resize_batch workers={workers}   {batch_ms:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark of `io` readers and writers over all installed parser backends.
+
+Run from the repository root with ``python -m benchmarks.io_backends``.
+"""
+
+import tempfile
+import timeit
+from pathlib import Path
+
+from somepytools import io
+
+# number of sections in generated config: roughly 2 KB, 200 KB and 2 MB of json
+SIZES = {"small": 10, "medium": 1_000, "large": 10_000}
+
+
+def make_config(n_sections: int) -> dict:
+    return {
+        f"section_{i}": {
+            "name": f"entry number {i}",
+            "enabled": i % 2 == 0,
+            "weight": i / 7,
+            "tags": [f"tag_{j}" for j in range(5)],
+            "limits": {"min": i, "max": i * 10},
+        }
+        for i in range(n_sections)
+    }
+
+
+def best_ms(func, *args, number: int, **kwargs) -> float:
+    best = min(timeit.repeat(lambda: func(*args, **kwargs), number=number, repeat=3))
+    return best / number * 1e3
+
+
+def bench_format(path: Path, data: dict, number: int, read, write=None):
+    """Prints read (and write if given) timings for every backend of the format."""
+    name = path.suffix.removeprefix(".")
+    backends = {
+        "json": io._JSON_DECODERS,
+        "yaml": io._yaml_backends()[1] if hasattr(io, "_yaml_backends") else {},
+        "toml": io._TOML_LOADERS,
+    }[name]
+    for backend in backends:
+        line = f"{name:<5} {path.stem:<7} {backend:<8}"
+        line += f" read {best_ms(read, path, backend=backend, number=number):>9.3f} ms"
+        if write is not None:
+            write_ms = best_ms(write, data, path, backend=backend, number=number)
+            line += f"  write {write_ms:>9.3f} ms"
+        print(line)
+
+    for mode, cache in [("copy", io.ParseCache()), ("view", io.ParseCache(immutable=True))]:
+        read_ms = best_ms(read, path, cache=cache, number=number)
+        print(f"{name:<5} {path.stem:<7} {'cached':<8} read {read_ms:>9.3f} ms  ({mode})")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size_name, n_sections in SIZES.items():
+            data = make_config(n_sections)
+            number = max(1, 2_000 // n_sections)
+            base = Path(tmp_dir) / size_name
+
+            path = io.write_json(data, base.with_suffix(".json"))
+            bench_format(path, data, number, io.read_json, io.write_json)
+
+            if hasattr(io, "write_yaml"):
+                path = io.write_yaml(data, base.with_suffix(".yaml"))
+                bench_format(path, data, number, io.read_yaml, io.write_yaml)
+
+            if hasattr(io, "write_toml"):
+                path = io.write_toml(data, base.with_suffix(".toml"))
+                bench_format(path, data, number, io.read_toml)
+
+
+if __name__ == "__main__":
+    main()
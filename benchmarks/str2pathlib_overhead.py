@@ -0,0 +1,44 @@
+"""Microbenchmark of `str2pathlib` wrapper overhead compared to the bare function.
+
+Run from the repository root with ``python -m benchmarks.str2pathlib_overhead``.
+"""
+
+import timeit
+from pathlib import Path
+
+from somepytools.general import str2pathlib
+
+
+def single(filename: Path, flag: bool = False):
+    return filename
+
+
+def several(source: Path, dest: Path, parents: bool = True, *, extra: Path = "x"):
+    return source
+
+
+CASES = {
+    "single, Path positional": (single, (Path("a.json"),), {}),
+    "single, str positional": (single, ("a.json",), {}),
+    "single, Path keyword": (single, (), {"filename": Path("a.json")}),
+    "several, Path positional": (several, (Path("a"), Path("b")), {}),
+    "several, str positional": (several, ("a", "b"), {}),
+}
+
+
+def per_call_ns(func, args: tuple, kwargs: dict, number: int) -> float:
+    best = min(timeit.repeat(lambda: func(*args, **kwargs), number=number, repeat=5))
+    return best / number * 1e9
+
+
+def main(number: int = 1_000_000):
+    print(f"{'case':<28} {'bare, ns':>10} {'wrapped, ns':>12} {'overhead, ns':>13}")
+    for name, (func, args, kwargs) in CASES.items():
+        wrapped = str2pathlib(func)
+        bare = per_call_ns(func, args, kwargs, number)
+        decorated = per_call_ns(wrapped, args, kwargs, number)
+        print(f"{name:<28} {bare:>10.1f} {decorated:>12.1f} {decorated - bare:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,34 @@
+import hashlib
 import importlib
+import json
 import os
+import re
 import shutil
+import tarfile
+import tempfile
+import threading
+import warnings
 import zipfile
+import zlib
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
 from enum import StrEnum
+from functools import partial
 from pathlib import Path
 from types import ModuleType
+from typing import BinaryIO
 
+from .constants import SIZE_CONSTANTS
+from .general import _open_zstd, rm_r
 from .typing import Directory, File, PathLike
 
+try:
+    import fcntl
+except ModuleNotFoundError:  # Windows
+    fcntl = None
+    import msvcrt
+
 
 class DriveBackend(StrEnum):
     Google = "google"
@@ -60,24 +81,70 @@ def _download_from_google(
     return Path(downloaded_path).expanduser().resolve()
 
 
+def _yandex_public_name(client, public_key: str) -> str:
+    name = client.get_public_meta(public_key).name
+    if not name:
+        raise RuntimeError(
+            f"Could not determine filename for Yandex public resource: {public_key!r}. "
+            "Make sure the link points to a file (not a folder) and is public."
+        )
+    return name
+
+
 def _download_from_yandex(public_key: str, root_dir: Directory) -> File:
     yadisk = _require("yadisk", DriveBackend.Yandex.value)
     with yadisk.Client() as client:
-        meta = client.get_public_meta(public_key)
-        name = meta.name
-        if not name:
-            raise RuntimeError(
-                f"Could not determine filename for Yandex public resource: {public_key!r}. "
-                "Make sure the link points to a file (not a folder) and is public."
-            )
-        target_path = (root_dir / name).resolve()
+        target_path = (root_dir / _yandex_public_name(client, public_key)).resolve()
         client.download_public(public_key, str(target_path))
 
     return target_path
 
 
-def _prepare_extract_dir(zip_path: File, *, overwrite_extract_dir: bool) -> Directory:
-    extracted_dir = zip_path.with_suffix("")
+def _stream_from_google(file_id: str, output: BinaryIO, *, quiet: bool, use_cookies: bool):
+    gdown = _require("gdown", DriveBackend.Google.value)
+    gdown.download(id=file_id, output=output, quiet=quiet, use_cookies=use_cookies)
+
+
+def _stream_from_yandex(public_key: str, output: BinaryIO):
+    yadisk = _require("yadisk", DriveBackend.Yandex.value)
+    with yadisk.Client() as client:
+        client.download_public(public_key, output)
+
+
+def _stream_archive_name(file_id: str, backend: DriveBackend) -> str:
+    """Name of the archive for streaming mode, where no file is saved by backend."""
+    if backend is DriveBackend.Yandex:
+        yadisk = _require("yadisk", DriveBackend.Yandex.value)
+        with yadisk.Client() as client:
+            return _yandex_public_name(client, file_id)
+    # gdown reports filename only when saving to disk, so file id is used instead
+    return re.sub(r"[^\w.-]+", "_", file_id).strip("_")
+
+
+_TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz", ".tar.zst", ".tzst")
+
+
+def _strip_archive_suffix(name: str) -> str:
+    lowered = name.lower()
+    for suffix in (".zip", *_TAR_SUFFIXES):
+        if lowered.endswith(suffix):
+            return name[: -len(suffix)]
+    return name
+
+
+def _prepare_extract_dir(
+    zip_path: File,
+    *,
+    overwrite_extract_dir: bool,
+    background_cleanup: bool = True,
+    cleanup_workers: int = 1,
+) -> Directory:
+    """Returns directory to extract archive to, removing its content if allowed.
+
+    Existing content is removed with :func:`.general.rm_r`: by default it's moved away
+    and deleted in background while the new archive is being extracted.
+    """
+    extracted_dir = zip_path.with_name(_strip_archive_suffix(zip_path.name))
 
     if not extracted_dir.exists():
         return extracted_dir
@@ -87,8 +154,7 @@ def _prepare_extract_dir(zip_path: File, *, overwrite_extract_dir: bool) -> Dire
             f"Extraction target exists and is not a directory: {extracted_dir}"
         )
 
-    existing_items = list(extracted_dir.iterdir())
-    if not existing_items:
+    if next(extracted_dir.iterdir(), None) is None:
         return extracted_dir
 
     if not overwrite_extract_dir:
@@ -97,17 +163,27 @@ def _prepare_extract_dir(zip_path: File, *, overwrite_extract_dir: bool) -> Dire
             "Pass overwrite_extract_dir=True to replace it."
         )
 
-    for item in existing_items:
-        if item.is_dir():
-            shutil.rmtree(item)
-        else:
-            item.unlink()
-
+    removal = rm_r(extracted_dir, background=background_cleanup, workers=cleanup_workers)
+    if removal is not None:
+        removal.add_done_callback(partial(_warn_failed_cleanup, extracted_dir))
     return extracted_dir
 
 
+def _warn_failed_cleanup(extracted_dir: Directory, removal: Future) -> None:
+    """Reports error of background removal, which otherwise would be lost."""
+    if (exc := removal.exception()) is not None:
+        warnings.warn(
+            f"Background removal of old content of {extracted_dir} failed ({exc!r}), "
+            f"remove `.{extracted_dir.name}.trash-*` in {extracted_dir.parent} manually",
+            RuntimeWarning,
+            stacklevel=1,
+        )
+
+
 _BYTES_PER_KIB = 1024
 _PROGRESS_MIN_ENTRIES = 4
+_COPY_BUFFER_SIZE = 1024**2
+_CHUNKS_PER_WORKER = 4
 
 
 def _human_size(n_bytes: int) -> str:
@@ -119,35 +195,119 @@ def _human_size(n_bytes: int) -> str:
     return f"{size:.1f} PiB"
 
 
-def unzip(zip_path: File, extract_dir: Directory, verbose: bool) -> None:
+def _safe_targets(
+    members: list[zipfile.ZipInfo], extract_dir: Directory
+) -> list[tuple[zipfile.ZipInfo, Path]]:
+    """Resolves extraction targets of ZIP members, rejecting ones that escape extract_dir."""
+    extract_root = extract_dir.resolve()
+    return [(member, _safe_target(member.filename, extract_root)) for member in members]
+
+
+def _safe_target(name: str, extract_root: Directory, kind: str = "ZIP") -> Path:
+    target_path = (extract_root / name).resolve()
+
+    if target_path != extract_root and extract_root not in target_path.parents:
+        raise ValueError(
+            f"Unsafe {kind} member path: {name!r}. Archive extraction was aborted."
+        )
+    return target_path
+
+
+def _extract_member(zf: zipfile.ZipFile, member: zipfile.ZipInfo, target_path: Path) -> None:
+    """Extracts a single member verifying its CRC while it is being written.
+
+    ``ZipFile.open`` validates CRC-32 once the member is read to the end, so the member
+    is decompressed only once. Partially written file is removed if the check fails.
+    """
+    if member.is_dir():
+        target_path.mkdir(parents=True, exist_ok=True)
+        return
+
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with zf.open(member) as source, target_path.open("wb") as target:
+            shutil.copyfileobj(source, target, _COPY_BUFFER_SIZE)
+    except (zipfile.BadZipFile, zlib.error, EOFError) as exc:
+        target_path.unlink(missing_ok=True)
+        raise ValueError(f"Corrupted ZIP member detected: {member.filename!r}") from exc
+
+
+def _extract_members(zip_path: File, indices: list[int], targets: list[str]) -> int:
+    """Worker of parallel :func:`unzip`: extracts members by their indices in infolist.
+
+    Each worker opens its own ZipFile handle since it can't be shared between processes.
+    """
+    with zipfile.ZipFile(zip_path, mode="r") as zf:
+        members = zf.infolist()
+        for index, target in zip(indices, targets, strict=True):
+            _extract_member(zf, members[index], Path(target))
+    return len(indices)
+
+
+def _split_members(
+    targets: list[tuple[zipfile.ZipInfo, Path]], n_chunks: int
+) -> list[tuple[list[int], list[str]]]:
+    """Splits members into chunks of similar total size (largest members go first)."""
+    order = sorted(
+        range(len(targets)), key=lambda i: targets[i][0].compress_size, reverse=True
+    )
+    chunks = [([], []) for _ in range(min(n_chunks, len(targets)))]
+    for position, index in enumerate(order):
+        indices, paths = chunks[position % len(chunks)]
+        indices.append(index)
+        paths.append(str(targets[index][1]))
+    return chunks
+
+
+def _extract_parallel(
+    zip_path: File,
+    targets: list[tuple[zipfile.ZipInfo, Path]],
+    workers: int,
+    report: Callable[[int, int], None],
+) -> None:
+    """Extracts members in processes, calling ``report(done_before, done)`` on progress."""
+    # Several chunks per worker to balance load and report progress more often
+    chunks = _split_members(targets, workers * _CHUNKS_PER_WORKER)
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_extract_members, zip_path, indices, paths)
+            for indices, paths in chunks
+        ]
+        try:
+            for future in as_completed(futures):
+                n_extracted = future.result()
+                report(done, done + n_extracted)
+                done += n_extracted
+        except BaseException:
+            executor.shutdown(cancel_futures=True)
+            raise
+
+
+def unzip(
+    zip_path: File, extract_dir: Directory, verbose: bool, *, workers: int | None = 1
+) -> None:
     """Extract ZIP archive into extract_dir, rejecting members that would escape it.
 
     This protects against path traversal entries such as ../../some_file.
+    Integrity of every member is checked while it is extracted (single decompression
+    pass), a corrupted member aborts extraction and its partial output is removed.
 
     Args:
         zip_path: path to an existing .zip file
         extract_dir: directory to extract zip file to
         verbose: to print status messages or not
+        workers: number of processes to extract members in parallel with,
+            None means number of CPUs. Worth it for archives with many members.
     """
+    workers = workers or os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"Number of workers must be positive, got {workers}")
     extract_dir.mkdir(parents=True, exist_ok=True)
-    extract_root = extract_dir.resolve()
 
     with zipfile.ZipFile(zip_path, mode="r") as zf:
-        if verbose:
-            print(f"Verifying integrity of {zip_path.name} ...")
-        bad_member = zf.testzip()
-        if bad_member is not None:
-            raise ValueError(f"Corrupted ZIP member detected: {bad_member!r}")
-
         members = zf.infolist()
-        for member in members:
-            target_path = (extract_dir / member.filename).resolve()
-
-            if target_path != extract_root and extract_root not in target_path.parents:
-                raise ValueError(
-                    f"Unsafe ZIP member path: {member.filename!r}. "
-                    "Archive extraction was aborted."
-                )
+        targets = _safe_targets(members, extract_dir)
 
         total = len(members)
         total_size = sum(m.file_size for m in members)
@@ -164,16 +324,387 @@ def unzip(zip_path: File, extract_dir: Directory, verbose: bool) -> None:
             else set()
         )
 
-        for i, member in enumerate(members, start=1):
-            zf.extract(member, extract_dir)
-            if i in checkpoints:
-                print(f"  ... {i}/{total} entries extracted ({i * 100 // total}%)")
+        def report(done_before: int, done: int):
+            if any(done_before < checkpoint <= done for checkpoint in checkpoints):
+                print(f"  ... {done}/{total} entries extracted ({done * 100 // total}%)")
 
-        if verbose:
-            print(f"Done: extracted {total} entries to {extract_dir}")
+        if workers == 1:
+            for i, (member, target_path) in enumerate(targets, start=1):
+                _extract_member(zf, member, target_path)
+                report(i - 1, i)
 
+    if workers > 1:
+        _extract_parallel(zip_path, targets, workers, report)
 
-def download_and_unpack(
+    if verbose:
+        print(f"Done: extracted {total} entries to {extract_dir}")
+
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_STREAM_PROGRESS_EVERY = 1000
+
+
+class _PrependedStream:
+    """Read-only stream returning ``head`` bytes first and then the rest of ``stream``."""
+
+    def __init__(self, head: bytes, stream: BinaryIO):
+        self.head = head
+        self.stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        if not self.head:
+            return self.stream.read(size)
+        if 0 <= size <= len(self.head):
+            data, self.head = self.head[:size], self.head[size:]
+            return data
+        # reads full `size` bytes, as tarfile sniffs compression (up to 10 bytes for bz2)
+        # from the first read only
+        rest = self.stream.read(size - len(self.head) if size >= 0 else -1)
+        data, self.head = self.head + rest, b""
+        return data
+
+
+def _decompressed(stream: BinaryIO) -> BinaryIO:
+    """Adds zstd decompression to ``stream`` if needed, others are detected by tarfile."""
+    head = stream.read(len(_ZSTD_MAGIC))
+    stream = _PrependedStream(head, stream)
+    if head != _ZSTD_MAGIC:
+        return stream
+    return _open_zstd(stream)
+
+
+def untar_stream(stream: BinaryIO, extract_dir: Directory, verbose: bool) -> None:
+    """Extract TAR archive (optionally gz/bz2/xz/zst compressed) read sequentially from stream.
+
+    The stream is never seeked, so extraction can run while the archive is still being
+    downloaded. As in :func:`unzip`, members that would escape extract_dir (including
+    links pointing outside of it) abort the extraction.
+
+    Args:
+        stream: binary file-like object with the archive
+        extract_dir: directory to extract archive to
+        verbose: to print status messages or not
+    """
+    extract_dir.mkdir(parents=True, exist_ok=True)
+    extract_root = extract_dir.resolve()
+    total = total_size = 0
+
+    with tarfile.open(
+        fileobj=_decompressed(stream), mode="r|*", bufsize=_COPY_BUFFER_SIZE
+    ) as tar:
+        for member in tar:
+            _safe_target(member.name, extract_root, kind="TAR")
+            try:
+                tar.extract(member, extract_root, filter="data")
+            except tarfile.FilterError as exc:
+                raise ValueError(
+                    f"Unsafe TAR member: {member.name!r} ({exc}). "
+                    "Archive extraction was aborted."
+                ) from exc
+            total += 1
+            total_size += member.size
+            if verbose and total % _STREAM_PROGRESS_EVERY == 0:
+                print(f"  ... {total} entries ({_human_size(total_size)}) extracted")
+
+    if verbose:
+        print(f"Done: extracted {total} entries ({_human_size(total_size)}) to {extract_dir}")
+
+
+def _stream_unpack(
+    write_archive: Callable[[BinaryIO], None], extract_dir: Directory, verbose: bool
+):
+    """Runs ``write_archive(pipe)`` in a thread and extracts TAR archive from the other end.
+
+    Network and disk work overlap and the archive itself is never written to disk.
+    """
+    read_fd, write_fd = os.pipe()
+    errors = []
+
+    def produce():
+        try:
+            with os.fdopen(write_fd, "wb") as writer:
+                write_archive(writer)
+        except BrokenPipeError:
+            pass  # extraction stopped, its error is reported by the consumer
+        except BaseException as exc:
+            errors.append(exc)
+
+    producer = threading.Thread(target=produce, name="download-stream", daemon=True)
+    producer.start()
+    try:
+        with os.fdopen(read_fd, "rb") as reader:
+            untar_stream(reader, extract_dir, verbose)
+    except tarfile.ReadError as exc:
+        if errors:  # archive is truncated because download failed
+            raise errors[0] from exc
+        raise
+    finally:
+        producer.join()
+
+    if errors:
+        raise errors[0]
+
+
+def _hashing(write_archive: Callable[[BinaryIO], None], hasher) -> Callable:
+    """Makes ``write_archive`` also feed all written bytes to ``hasher``."""
+
+    class HashingWriter:
+        def __init__(self, output: BinaryIO):
+            self.output = output
+
+        def write(self, data: bytes) -> int:
+            hasher.update(data)
+            return self.output.write(data)
+
+    return lambda output: write_archive(HashingWriter(output))
+
+
+def _fetch_and_unpack(  # noqa: PLR0913
+    file_id: str,
+    root_dir: Directory,
+    backend: DriveBackend,
+    *,
+    quiet: bool,
+    use_cookies: bool,
+    overwrite_extract_dir: bool,
+    stream: bool,
+    hasher=None,
+) -> tuple[Path | None, Path]:
+    """Implementation of :func:`download_and_unpack` optionally hashing archive content."""
+    if stream:
+        extracted_dir = _prepare_extract_dir(
+            root_dir / _stream_archive_name(file_id, backend),
+            overwrite_extract_dir=overwrite_extract_dir,
+        )
+        if backend is DriveBackend.Google:
+            write_archive = partial(
+                _stream_from_google, file_id, quiet=quiet, use_cookies=use_cookies
+            )
+        else:
+            write_archive = partial(_stream_from_yandex, file_id)
+        if hasher is not None:
+            write_archive = _hashing(write_archive, hasher)
+        _stream_unpack(write_archive, extracted_dir, verbose=not quiet)
+        return None, extracted_dir
+
+    if backend is DriveBackend.Google:
+        zip_path = _download_from_google(
+            file_id, root_dir, quiet=quiet, use_cookies=use_cookies
+        )
+    else:
+        zip_path = _download_from_yandex(file_id, root_dir)
+
+    if not zip_path.exists():
+        raise FileNotFoundError(f"Downloaded path does not exist: {zip_path}")
+
+    is_tar = zip_path.name.lower().endswith(_TAR_SUFFIXES)
+    if zip_path.suffix.lower() != ".zip" and not is_tar:
+        raise ValueError(f"Downloaded file is not a .zip or .tar archive: {zip_path.name}")
+
+    extracted_dir = _prepare_extract_dir(zip_path, overwrite_extract_dir=overwrite_extract_dir)
+
+    if hasher is not None:
+        with zip_path.open("rb") as file:
+            while chunk := file.read(_COPY_BUFFER_SIZE):
+                hasher.update(chunk)
+
+    if is_tar:
+        with zip_path.open("rb") as file:
+            untar_stream(file, extracted_dir, verbose=not quiet)
+    else:
+        unzip(zip_path=zip_path, extract_dir=extracted_dir, verbose=not quiet)
+
+    return zip_path, extracted_dir
+
+
+_LOCK_FILE_BYTES = 1
+
+
+@contextmanager
+def _file_lock(path: File):
+    """Exclusive inter-process lock on ``path`` (created if missing)."""
+    with path.open("a+b") as file:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, _LOCK_FILE_BYTES)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+            else:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, _LOCK_FILE_BYTES)
+
+
+def _write_json_atomic(data: dict, path: File) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with tmp_path.open("w") as file:
+        json.dump(data, file)
+    tmp_path.replace(path)
+
+
+class DriveCache:
+    """Content-addressed cache of archives extracted by :func:`download_and_unpack`.
+
+    Archives are keyed by backend + file_id and stored by hash of their content,
+    so the same content referenced by different ids is stored once. Size of the cache
+    is capped, least recently used archives are evicted first. Processes on the same
+    machine can share the cache safely (operations are guarded by file locks).
+
+    Layout of the cache directory:
+        refs/<key>.json - backend + file_id to content hash mapping
+        objects/<hash>/ - extracted archive
+        objects/<hash>.json - manifest of extracted files, its mtime is last access time
+    """
+
+    def __init__(self, root: PathLike, max_size: float = 50, units: str = "Gb"):
+        """Creates (or opens existing) cache.
+
+        Args:
+            root: directory of the cache
+            max_size: maximal total size of extracted files in `units`
+            units: size units (from .constants.SIZE_CONSTANTS.keys())
+        """
+        self.root = Path(root).expanduser().resolve()
+        self.max_size = max_size * SIZE_CONSTANTS[units]
+        for subdir in ("refs", "objects", "locks", "tmp"):
+            (self.root / subdir).mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _key(backend: DriveBackend, file_id: str) -> str:
+        return hashlib.sha256(f"{DriveBackend(backend).value}:{file_id}".encode()).hexdigest()
+
+    def _lock(self, name: str):
+        return _file_lock(self.root / "locks" / f"{name}.lock")
+
+    def _object_dir(self, content_hash: str) -> Directory:
+        return self.root / "objects" / content_hash
+
+    def _manifest_path(self, content_hash: str) -> File:
+        return self.root / "objects" / f"{content_hash}.json"
+
+    def _valid_object(self, content_hash: str) -> Directory | None:
+        object_dir = self._object_dir(content_hash)
+        try:
+            with self._manifest_path(content_hash).open() as file:
+                manifest = json.load(file)
+            for name, size in manifest["files"].items():
+                if (object_dir / name).stat().st_size != size:
+                    return None
+        except (OSError, ValueError, KeyError):
+            return None
+        return object_dir
+
+    def lookup(self, backend: DriveBackend, file_id: str) -> Directory | None:
+        """Returns extracted dir of cached archive (marking it as recently used) or None."""
+        try:
+            with (self.root / "refs" / f"{self._key(backend, file_id)}.json").open() as file:
+                content_hash = json.load(file)["content_hash"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+        with self._lock("objects"):
+            object_dir = self._valid_object(content_hash)
+            if object_dir is not None:
+                os.utime(self._manifest_path(content_hash))
+        return object_dir
+
+    def get_or_fetch(
+        self,
+        backend: DriveBackend,
+        file_id: str,
+        fetch: Callable[..., tuple[Path | None, Path]],
+    ) -> Directory:
+        """Returns cached extracted dir or fetches archive with ``fetch`` and caches it.
+
+        Args:
+            backend: drive backend of the file
+            file_id: public file identifier as in :func:`download_and_unpack`
+            fetch: ``fetch(root_dir, hasher=hasher)`` downloads archive to root_dir,
+                extracts it and feeds archive content to hasher; returns
+                (archive path, extracted dir)
+        """
+        key = self._key(backend, file_id)
+        with self._lock(key):  # only one process downloads the same file
+            cached = self.lookup(backend, file_id)
+            if cached is not None:
+                return cached
+
+            hasher = hashlib.sha256()
+            tmp_dir = Path(tempfile.mkdtemp(dir=self.root / "tmp"))
+            try:
+                _, extracted_dir = fetch(tmp_dir, hasher=hasher)
+                content_hash = hasher.hexdigest()
+                files = {
+                    path.relative_to(extracted_dir).as_posix(): path.stat().st_size
+                    for path in extracted_dir.rglob("*")
+                    if path.is_file() and not path.is_symlink()
+                }
+                with self._lock("objects"):
+                    if self._valid_object(content_hash) is None:
+                        shutil.rmtree(self._object_dir(content_hash), ignore_errors=True)
+                        extracted_dir.rename(self._object_dir(content_hash))
+                        manifest = {"files": files, "size": sum(files.values())}
+                        _write_json_atomic(manifest, self._manifest_path(content_hash))
+                    else:
+                        os.utime(self._manifest_path(content_hash))
+                    _write_json_atomic(
+                        {
+                            "backend": DriveBackend(backend).value,
+                            "file_id": file_id,
+                            "content_hash": content_hash,
+                        },
+                        self.root / "refs" / f"{key}.json",
+                    )
+                    self._evict(keep=content_hash)
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        return self._object_dir(content_hash)
+
+    def _evict(self, keep: str | None = None) -> int:
+        """Removes least recently used objects until cache fits `max_size`.
+
+        Must be called under ``objects`` lock.
+
+        Returns:
+            number of freed bytes
+        """
+        entries = []
+        for manifest_path in (self.root / "objects").glob("*.json"):
+            try:
+                with manifest_path.open() as file:
+                    size = json.load(file)["size"]
+                entries.append((manifest_path.stat().st_mtime, size, manifest_path.stem))
+            except (OSError, ValueError, KeyError):
+                continue
+
+        total = sum(size for _, size, _ in entries)
+        freed = 0
+        for _, size, content_hash in sorted(entries):
+            if total - freed <= self.max_size:
+                break
+            if content_hash == keep:
+                continue
+            self._manifest_path(content_hash).unlink(missing_ok=True)
+            shutil.rmtree(self._object_dir(content_hash), ignore_errors=True)
+            freed += size
+        return freed
+
+    def evict(self) -> int:
+        """Removes least recently used archives until cache fits its size limit.
+
+        Returns:
+            number of freed bytes
+        """
+        with self._lock("objects"):
+            return self._evict()
+
+
+def download_and_unpack(  # noqa: PLR0913
     file_id: str,
     root_dir: PathLike = ".",
     *,
@@ -181,8 +712,10 @@ def download_and_unpack(
     quiet: bool = False,
     use_cookies: bool = True,
     overwrite_extract_dir: bool = False,
-) -> tuple[Path, Path]:
-    """Download a public ZIP file from a cloud drive and unpack it.
+    stream: bool = False,
+    cache: DriveCache | None = None,
+) -> tuple[Path | None, Path]:
+    """Download a public ZIP or TAR archive from a cloud drive and unpack it.
 
     For Google Drive uses `gdown`, for Yandex Disk - `yadisk[sync-defaults]`.
 
@@ -190,7 +723,7 @@ def download_and_unpack(
         file_id: Public file identifier. For ``backend="google"`` it is the Google Drive
             file ID or shared URL; for ``backend="yandex"`` it is the Yandex Disk public
             key or public URL (e.g. ``https://disk.yandex.ru/d/...``).
-        root_dir: Directory where the ZIP archive and extracted directory will be stored.
+        root_dir: Directory where the archive and extracted directory will be stored.
         backend: Source to download the file from. One of :class:`DriveBackend` values.
         quiet: If True, suppress progress output (passed to ``gdown.download()`` for the
             Google backend, and used to silence extraction progress in :func:`unzip`).
@@ -201,32 +734,35 @@ def download_and_unpack(
             If True, delete existing files in the extraction directory before extraction.
             If False, raise FileExistsError when the extraction directory already exists
             and is non-empty.
+        stream: If True, the archive must be a TAR (.tar, .tar.gz, .tar.zst etc.)
+            and it's extracted while being downloaded without saving it to disk.
+            Extracted dir is named after the archive for Yandex and after file_id
+            for Google backend (gdown doesn't report filename in this mode).
+        cache: If provided, extracted archive is taken from (or put to) this cache,
+            and a valid cache hit doesn't touch network at all. `root_dir` and
+            `overwrite_extract_dir` are ignored, returned dir lives inside the cache
+            and must not be modified.
 
     Returns:
-        zip_path: downloaded zip file path
-        extracted_dir: dir where zip is extracted
+        zip_path: downloaded archive path (None in streaming and cached modes)
+        extracted_dir: dir where archive is extracted
     """
-    root_dir = Path(root_dir).expanduser().resolve()
-    root_dir.mkdir(parents=True, exist_ok=True)
-
     backend = DriveBackend(backend)
-    if backend is DriveBackend.Google:
-        zip_path = _download_from_google(
-            file_id, root_dir, quiet=quiet, use_cookies=use_cookies
-        )
-    elif backend is DriveBackend.Yandex:
-        zip_path = _download_from_yandex(file_id, root_dir)
-    else:
+    if backend not in {DriveBackend.Google, DriveBackend.Yandex}:
         raise ValueError(f"Unsupported drive backend: {backend!r}")
 
-    if not zip_path.exists():
-        raise FileNotFoundError(f"Downloaded path does not exist: {zip_path}")
-
-    if zip_path.suffix.lower() != ".zip":
-        raise ValueError(f"Downloaded file is not a .zip archive: {zip_path.name}")
-
-    extracted_dir = _prepare_extract_dir(zip_path, overwrite_extract_dir=overwrite_extract_dir)
-
-    unzip(zip_path=zip_path, extract_dir=extracted_dir, verbose=not quiet)
+    fetch = partial(
+        _fetch_and_unpack,
+        file_id,
+        backend=backend,
+        quiet=quiet,
+        use_cookies=use_cookies,
+        overwrite_extract_dir=overwrite_extract_dir,
+        stream=stream,
+    )
+    if cache is not None:
+        return None, cache.get_or_fetch(backend, file_id, fetch)
 
-    return zip_path, extracted_dir
+    root_dir = Path(root_dir).expanduser().resolve()
+    root_dir.mkdir(parents=True, exist_ok=True)
+    return fetch(root_dir)
@@ -1,16 +1,128 @@
+import base64
+import errno
+import hashlib
+import http.client
+import importlib
+import os
+import re
 import shutil
-from collections.abc import Iterator
-from datetime import date, datetime, timedelta
+import socket
+import stat
+import threading
+import time
+import uuid
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
 from functools import wraps
-from inspect import getfullargspec
+from inspect import (
+    getfullargspec,
+    isasyncgenfunction,
+    iscoroutinefunction,
+    isgeneratorfunction,
+)
 from pathlib import Path
-from typing import Any, get_args
-from urllib.parse import urlparse
-from urllib.request import urlopen
+from typing import IO, TYPE_CHECKING, Any, get_args
+from urllib.error import HTTPError
+from urllib.parse import ParseResult, unquote, urljoin, urlparse
+from urllib.request import Request, getproxies, proxy_bypass, urlopen
 from zipfile import ZipFile
 
-from .constants import SIZE_CONSTANTS
-from .typing import Directory, File
+from .constants import SIZE_CONSTANTS, TIME_CONSTANTS
+from .typing import Directory, File, PathLike
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_NO_DEFAULT = object()
+
+
+def _str_to_path(item: Any) -> Any:
+    if isinstance(item, str):
+        return Path(item)
+    return item
+
+
+def _is_path_annotation(arg_type: Any) -> bool:
+    return arg_type == Path or Path in get_args(arg_type)
+
+
+def _make_converter(func) -> Callable | None:  # noqa: C901
+    """Builds a function converting ``(args, kwargs)`` of ``func`` call in place.
+
+    All signature inspection happens here, once, so the returned converter only touches
+        arguments annotated as Path. Returns None if there is nothing to convert.
+    """
+    full_arg_spec = getfullargspec(func)
+    all_defaults = full_arg_spec.defaults or ()
+    kwonly_defaults = full_arg_spec.kwonlydefaults or {}
+
+    positional = []  # (index, name, default) for positional-or-keyword Path arguments
+    keyword_only = []  # (name, default) for keyword-only Path arguments
+    for arg_name, arg_type in full_arg_spec.annotations.items():
+        if arg_name == "return" or not _is_path_annotation(arg_type):
+            continue
+
+        if arg_name in full_arg_spec.kwonlyargs:
+            default = kwonly_defaults.get(arg_name, _NO_DEFAULT)
+        elif arg_name in full_arg_spec.args:
+            index = full_arg_spec.args.index(arg_name)
+            def_index = index - len(full_arg_spec.args) + len(all_defaults)
+            default = all_defaults[def_index] if def_index >= 0 else _NO_DEFAULT
+        else:  # annotated *args or **kwargs
+            continue
+
+        # Only string defaults have to be substituted, others are passed as is by Python
+        default = Path(default) if isinstance(default, str) else _NO_DEFAULT
+        if arg_name in full_arg_spec.kwonlyargs:
+            keyword_only.append((arg_name, default))
+        else:
+            positional.append((index, arg_name, default))
+
+    if not positional and not keyword_only:
+        return None
+
+    if len(positional) == 1 and not keyword_only:
+        # The most common case (e.g. `read_json(filename)`) gets its own converter
+        ((index, arg_name, default),) = positional
+
+        def convert_single(args: tuple, kwargs: dict) -> tuple:
+            if index < len(args):
+                if isinstance(args[index], str):
+                    args = (*args[:index], Path(args[index]), *args[index + 1 :])
+            elif arg_name in kwargs:
+                kwargs[arg_name] = _str_to_path(kwargs[arg_name])
+            elif default is not _NO_DEFAULT:
+                kwargs[arg_name] = default
+            return args
+
+        return convert_single
+
+    positional = tuple(positional)
+    keyword_only = tuple(keyword_only)
+
+    def convert(args: tuple, kwargs: dict) -> tuple:
+        new_args = None
+        for index, arg_name, default in positional:
+            if index < len(args):
+                if isinstance(args[index], str):
+                    if new_args is None:  # copy only when something actually changes
+                        new_args = list(args)
+                    new_args[index] = Path(args[index])
+            elif arg_name in kwargs:
+                kwargs[arg_name] = _str_to_path(kwargs[arg_name])
+            elif default is not _NO_DEFAULT:
+                kwargs[arg_name] = default
+        for arg_name, default in keyword_only:
+            if arg_name in kwargs:
+                kwargs[arg_name] = _str_to_path(kwargs[arg_name])
+            elif default is not _NO_DEFAULT:
+                kwargs[arg_name] = default
+        return args if new_args is None else tuple(new_args)
+
+    return convert
 
 
 def str2pathlib(func):  # noqa: C901
@@ -22,6 +134,11 @@ def str2pathlib(func):  # noqa: C901
     Under the hood it converts all input variables annotated as Path
         and having type str to Path objects.
 
+    The wrapper is specialized to the signature at decoration time: functions without
+        Path arguments are returned untouched, calls with Path arguments don't copy
+        anything. Coroutine, generator and async generator functions stay such
+        (e.g. ``isgeneratorfunction`` holds for the wrapper).
+
     Example:
         from pathlib import Path
 
@@ -35,92 +152,610 @@ def str2pathlib(func):  # noqa: C901
 
         >>> PosixPath("~/home/user/my_dir")
     """
+    convert = _make_converter(func)
+    if convert is None:
+        return func
 
-    def str_to_path(item: Any) -> Any:
-        if isinstance(item, str):
-            return Path(item)
-        return item
+    if iscoroutinefunction(func):
 
-    full_arg_spec = getfullargspec(func)
-    all_defaults = full_arg_spec.defaults or ()
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            return await func(*convert(args, kwargs), **kwargs)
 
-    path_args = []
-    for arg_name, arg_type in full_arg_spec.annotations.items():
-        if (arg_type != Path and Path not in get_args(arg_type)) or arg_name == "return":
-            continue
+        return async_wrapper
 
-        if arg_name in full_arg_spec.kwonlyargs:
-            index = float("inf")
-            needs_default = True
-            default = full_arg_spec.kwonlydefaults[arg_name]
-        else:
-            index = full_arg_spec.args.index(arg_name)
-            def_index = index - len(full_arg_spec.args) + len(all_defaults)
-            needs_default = def_index >= 0
-            default = full_arg_spec.defaults[def_index] if needs_default else None
+    if isasyncgenfunction(func):
+
+        @wraps(func)
+        async def async_gen_wrapper(*args, **kwargs):
+            agen = func(*convert(args, kwargs), **kwargs)
+            try:
+                value = await anext(agen)
+                while True:
+                    try:
+                        sent = yield value
+                    except GeneratorExit:
+                        await agen.aclose()
+                        raise
+                    except BaseException as exc:  # forwarded into the generator
+                        value = await agen.athrow(exc)
+                    else:
+                        value = await agen.asend(sent)
+            except StopAsyncIteration:
+                return
+
+        return async_gen_wrapper
+
+    if isgeneratorfunction(func):
+
+        @wraps(func)
+        def gen_wrapper(*args, **kwargs):
+            return (yield from func(*convert(args, kwargs), **kwargs))
 
-        path_args.append((index, arg_name, needs_default, str_to_path(default)))
+        return gen_wrapper
 
     @wraps(func)
     def wrapper(*args, **kwargs):
-        args = list(args)
+        return func(*convert(args, kwargs), **kwargs)
 
-        for index, arg_name, needs_default, default in path_args:
-            if arg_name in kwargs:
-                kwargs[arg_name] = str_to_path(kwargs[arg_name])
-            elif index < len(args):  # this was passed as arg
-                args[index] = str_to_path(args[index])
-            elif needs_default:
-                kwargs[arg_name] = default
+    return wrapper
 
-        return func(*args, **kwargs)
 
-    return wrapper
+_DOWNLOAD_CHUNK_SIZE = 1024**2
+_HTTP_PARTIAL_CONTENT = 206
+_HTTP_RANGE_NOT_SATISFIABLE = 416
+
+
+def _url_filename(url: str) -> str:
+    return urlparse(url).path.split("/")[-1]
+
+
+def _update_hash_from_file(hasher, path: File, buffer: bytearray) -> None:
+    """Feeds already downloaded part of the file to ``hasher`` (for resumed downloads)."""
+    view = memoryview(buffer)
+    with path.open("rb") as file:
+        while n_read := file.readinto(buffer):
+            hasher.update(view[:n_read])
+
+
+def _stream_to_file(response, file, buffer: bytearray, hasher=None) -> int:
+    """Copies ``response`` body into ``file`` chunk by chunk through reusable ``buffer``.
+
+    Returns:
+        Number of bytes written
+    """
+    view = memoryview(buffer)
+    written = 0
+    while n_read := response.readinto(buffer):
+        chunk = view[:n_read]
+        file.write(chunk)
+        if hasher is not None:
+            hasher.update(chunk)
+        written += n_read
+    return written
+
+
+def _urlopen(url: str, headers: dict[str, str]):
+    return urlopen(Request(url, headers=headers))
+
+
+def _download(  # noqa: PLR0913
+    url: str,
+    save_path: File | Directory | None,
+    open_url: Callable,
+    *,
+    checksum: str | None,
+    hash_name: str,
+    resume: bool,
+    chunk_size: int,
+) -> tuple[File, int]:
+    """Implementation of :func:`download_url` with pluggable ``open_url(url, headers)``.
+
+    Returns:
+        path to downloaded file and number of bytes received from network
+    """
+    if save_path is None:
+        save_path = Path(_url_filename(url))
+    elif save_path.is_dir():
+        save_path = save_path / _url_filename(url)
+    part_path = save_path.with_name(save_path.name + ".part")
+
+    offset = part_path.stat().st_size if resume and part_path.exists() else 0
+    hasher = hashlib.new(hash_name) if checksum is not None else None
+    buffer = bytearray(chunk_size)
+    received = 0
+
+    try:
+        with open_url(url, {"Range": f"bytes={offset}-"} if offset else {}) as response:
+            if offset and response.status != _HTTP_PARTIAL_CONTENT:
+                offset = 0  # server ignored Range header and sends the whole file
+            if offset and hasher is not None:
+                _update_hash_from_file(hasher, part_path, buffer)
+            with part_path.open("ab" if offset else "wb") as file:
+                received = _stream_to_file(response, file, buffer, hasher)
+    except HTTPError as exc:
+        # `.part` file already holds the whole content
+        if not offset or exc.code != _HTTP_RANGE_NOT_SATISFIABLE:
+            raise
+        if hasher is not None:
+            _update_hash_from_file(hasher, part_path, buffer)
+
+    if hasher is not None and hasher.hexdigest() != checksum.lower():
+        part_path.unlink()
+        raise ValueError(
+            f"Checksum mismatch for {url}: expected {checksum}, got {hasher.hexdigest()}"
+        )
+
+    part_path.replace(save_path)
+    return save_path, received
 
 
 @str2pathlib
-def download_url(url: str, save_path: File | Directory | None = None) -> File:
+def download_url(
+    url: str,
+    save_path: File | Directory | None = None,
+    *,
+    checksum: str | None = None,
+    hash_name: str = "sha256",
+    resume: bool = True,
+    chunk_size: int = _DOWNLOAD_CHUNK_SIZE,
+) -> File:
     """Downloads and saves data from url.
 
+    Data is streamed to ``<save_path>.part`` file chunk by chunk (so memory footprint
+        doesn't depend on file size) which is atomically renamed to ``save_path``
+        when download is complete. Interrupted download is resumed from ``.part`` file
+        with HTTP Range request if server supports it.
+
     Args:
         url: address of file to download
         save_path: file or directory path to save to.
             If filename is not provided, it is taken from url.
             If directory is not provided, file saved to current directory.
+        checksum: expected hex digest of the file, verified while data is streamed
+        hash_name: name of hashing algorithm for `checksum` (from ``hashlib``)
+        resume: continue from existing ``.part`` file or start from scratch
+        chunk_size: size of buffer for reading response in bytes
 
     Returns:
         Actual path to downloaded file
+
+    Raises:
+        ValueError: if checksum of downloaded file doesn't match the expected one
     """
-    if save_path is None:
-        save_path = Path(urlparse(url).path.split("/")[-1])
-    elif save_path.is_dir():
-        save_path = save_path / urlparse(url).path.split("/")[-1]
+    path, _ = _download(
+        url,
+        save_path,
+        _urlopen,
+        checksum=checksum,
+        hash_name=hash_name,
+        resume=resume,
+        chunk_size=chunk_size,
+    )
+    return path
+
+
+_MAX_REDIRECTS = 5
+_HTTP_BAD_REQUEST = 400
+_HTTP_SERVER_ERROR = 500
+_HTTP_RETRIABLE_CLIENT_ERRORS = frozenset({408, 429})
+
+
+class _HostConnections(threading.local):
+    """Per-thread keep-alive HTTP(S) connections, one per host.
+
+    Mimics ``urlopen`` for GET requests so it can be used by :func:`_download`,
+        including proxies from environment (``HTTP(S)_PROXY`` and ``NO_PROXY``).
+    """
+
+    def __init__(self, timeout: float | None):
+        self.timeout = timeout
+        self.proxies = getproxies()
+        # connection and, for plain HTTP proxy, headers to send it with every request
+        self.connections: dict[
+            tuple[str, str], tuple[http.client.HTTPConnection, dict[str, str] | None]
+        ] = {}
+        self.latency = 0.0  # time to response headers of the last request
+
+    def _connect(
+        self, parts: ParseResult
+    ) -> tuple[http.client.HTTPConnection, dict[str, str] | None]:
+        https = parts.scheme == "https"
+        connection_class = http.client.HTTPSConnection if https else http.client.HTTPConnection
+        proxy = self.proxies.get(parts.scheme)
+        if not proxy or proxy_bypass(parts.hostname or ""):
+            return connection_class(parts.netloc, timeout=self.timeout), None
+
+        proxy = urlparse(proxy if "://" in proxy else "http://" + proxy)
+        proxy_headers = {}
+        if proxy.username:
+            credentials = f"{unquote(proxy.username)}:{unquote(proxy.password or '')}"
+            token = base64.b64encode(credentials.encode()).decode()
+            proxy_headers["Proxy-Authorization"] = f"Basic {token}"
+        connection = connection_class(proxy.hostname, proxy.port, timeout=self.timeout)
+        if not https:
+            return connection, proxy_headers
+        connection.set_tunnel(parts.netloc, headers=proxy_headers)
+        return connection, None
+
+    def __call__(self, url: str, headers: dict[str, str]) -> http.client.HTTPResponse:
+        for _ in range(_MAX_REDIRECTS + 1):
+            parts = urlparse(url)
+            key = (parts.scheme, parts.netloc)
+            if key not in self.connections:
+                self.connections[key] = self._connect(parts)
+            connection, proxy_headers = self.connections[key]
+
+            target = parts.path or "/"
+            if parts.query:
+                target += "?" + parts.query
+            if proxy_headers is not None:  # plain HTTP proxy expects absolute url
+                target = f"{parts.scheme}://{parts.netloc}{target}"
+                headers = {**headers, **proxy_headers}
+            start = time.perf_counter()
+            try:
+                connection.request("GET", target, headers=headers)
+                response = connection.getresponse()
+            except (OSError, http.client.HTTPException):
+                connection.close()  # will be reopened by the next request
+                raise
+            self.latency = time.perf_counter() - start
+
+            location = response.getheader("Location")
+            if response.status in {301, 302, 303, 307, 308} and location:
+                response.read()
+                url = urljoin(url, location)
+                continue
+            if response.status >= _HTTP_BAD_REQUEST:
+                response.read()
+                raise HTTPError(url, response.status, response.reason, response.msg, None)
+            return response
+
+        raise HTTPError(url, response.status, "Too many redirects", response.msg, None)
+
 
-    with urlopen(url) as response, save_path.open("wb") as file:
-        file.write(response.read())
+@dataclass
+class DownloadResult:
+    """Outcome of downloading a single url by :func:`download_urls`."""
 
-    return save_path
+    url: str
+    path: File | None = None
+    error: Exception | None = None
+    n_bytes: int = 0
+    elapsed: float = 0.0
+    attempts: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class DownloadReport:
+    """Results of :func:`download_urls` in order of inputs with aggregate statistics.
+
+    Attributes:
+        results: per-url outcomes
+        n_bytes: total number of bytes received
+        elapsed: wall time of the whole batch in seconds
+        host_latency: mean time to response headers per host in seconds
+    """
+
+    results: list[DownloadResult]
+    n_bytes: int
+    elapsed: float
+    host_latency: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.n_bytes / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def failed(self) -> list[DownloadResult]:
+        return [result for result in self.results if not result.ok]
+
+
+def _is_retriable(exc: Exception) -> bool:
+    """Checks whether ``exc`` is a network or server error (local file errors are not)."""
+    if isinstance(exc, HTTPError):
+        return exc.code >= _HTTP_SERVER_ERROR or exc.code in _HTTP_RETRIABLE_CLIENT_ERRORS
+    return isinstance(
+        exc, ConnectionError | TimeoutError | socket.gaierror | http.client.HTTPException
+    )
+
+
+def download_urls(
+    items: Iterable[tuple[str, PathLike | None]],
+    *,
+    max_workers: int = 8,
+    retries: int = 3,
+    backoff: float = 0.5,
+    timeout: float | None = 60.0,
+    **kwargs,
+) -> DownloadReport:
+    """Downloads many urls concurrently, see :func:`download_url` for a single one.
+
+    Connections are kept alive and reused per host within each worker thread
+        (through proxies from environment, as with ``urlopen``).
+        Failed items don't stop the batch: their errors are stored in results.
+
+    Args:
+        items: pairs of (url, save_path) as for :func:`download_url`
+        max_workers: number of concurrent downloads
+        retries: number of retries after network or server (5xx) errors
+        backoff: delay before the first retry in seconds, doubled on every next one
+        timeout: socket timeout in seconds
+        **kwargs: keyword arguments of :func:`download_url` (checksum etc.)
+            applied to every item
+
+    Returns:
+        Report with per-item results in order of `items` and throughput statistics
+    """
+    items = [(url, None if path is None else Path(path)) for url, path in items]
+    download_kwargs = {
+        "checksum": None,
+        "hash_name": "sha256",
+        "resume": True,
+        "chunk_size": _DOWNLOAD_CHUNK_SIZE,
+    } | kwargs
+    connections = _HostConnections(timeout)
+    latencies: dict[str, list[float]] = {}
+    latencies_lock = threading.Lock()
+    open_connections = []
+
+    def worker_init():
+        open_connections.append(connections.connections)
+
+    def fetch(item: tuple[str, Path | None]) -> DownloadResult:
+        url, save_path = item
+        result = DownloadResult(url)
+        start = time.perf_counter()
+        while True:
+            result.attempts += 1
+            try:
+                result.path, result.n_bytes = _download(
+                    url, save_path, connections, **download_kwargs
+                )
+            except Exception as exc:
+                if result.attempts > retries or not _is_retriable(exc):
+                    result.error = exc
+                    break
+                time.sleep(backoff * 2 ** (result.attempts - 1))
+            else:
+                with latencies_lock:
+                    latencies.setdefault(urlparse(url).netloc, []).append(connections.latency)
+                break
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers, initializer=worker_init) as executor:
+        results = list(executor.map(fetch, items))
+    elapsed = time.perf_counter() - start
+
+    for host_connections in open_connections:
+        for connection, _ in host_connections.values():
+            connection.close()
+
+    return DownloadReport(
+        results=results,
+        n_bytes=sum(result.n_bytes for result in results),
+        elapsed=elapsed,
+        host_latency={host: sum(times) / len(times) for host, times in latencies.items()},
+    )
 
 
 @str2pathlib
-def extract_zip(zip_path: File, save_dir: Directory):
+def extract_zip(zip_path: File, save_dir: Directory, *, workers: int | None = 1):
     """Unzips archive.
 
     Args:
         zip_path: path to *.zip file to unzip
         save_dir:  path for files and folders to save
+        workers: number of processes to extract members in parallel with
+            (None means number of CPUs). Parallel mode is :func:`.drives.unzip`,
+            which rejects archives with members escaping `save_dir`.
     """
+    if workers != 1:
+        from .drives import unzip  # noqa: PLC0415 - drives depends on this module
+
+        unzip(zip_path, save_dir, verbose=False, workers=workers)
+        return
+
     with ZipFile(zip_path) as zip_file:
         zip_file.extractall(save_dir)
 
 
+_COPY_CHUNK_SIZE = 64 * 1024**2
+# errors meaning that zero-copy syscall is not supported for these files
+_NO_FAST_COPY_ERRNOS = frozenset(
+    {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF}
+)
+
+
+def _open_zstd(file: PathLike | IO, mode: str = "rb", encoding: str | None = None) -> IO:
+    """Opens zstd compressed file (path or file object) like ``gzip.open`` does.
+
+    Uses stdlib ``compression.zstd`` (Python 3.14+) or the optional `zstandard` package.
+    """
+    try:  # Python 3.14+
+        return importlib.import_module("compression.zstd").open(file, mode, encoding=encoding)
+    except ImportError:
+        pass
+    try:
+        zstandard = importlib.import_module("zstandard")
+    except ImportError as exc:
+        raise ImportError(
+            "Reading and writing .zst files requires the optional `zstandard` package "
+            "(or Python 3.14+). Install it with `pip install zstandard`."
+        ) from exc
+    return zstandard.open(file, mode, encoding=encoding)
+
+
+def _sendfile(infd: int, outfd: int, count: int) -> int:
+    return os.sendfile(outfd, infd, None, count)
+
+
+def _fast_copy(source: File, dest: File) -> None:
+    """Copies file content trying zero-copy syscalls first.
+
+    ``os.copy_file_range`` (may use reflinks / server-side copy) is tried first, then
+    ``os.sendfile`` and finally regular buffered copy. Each next method continues
+    from the offset where the previous one has stopped.
+    """
+    syscalls = []
+    if hasattr(os, "copy_file_range"):
+        syscalls.append(os.copy_file_range)
+    if hasattr(os, "sendfile"):
+        syscalls.append(_sendfile)
+
+    with source.open("rb") as fsrc, dest.open("wb") as fdst:
+        for syscall in syscalls:
+            try:
+                while syscall(fsrc.fileno(), fdst.fileno(), _COPY_CHUNK_SIZE):
+                    pass
+            except OSError as exc:
+                if exc.errno not in _NO_FAST_COPY_ERRNOS:
+                    raise
+            else:
+                return
+        shutil.copyfileobj(fsrc, fdst, _COPY_CHUNK_SIZE)
+
+
+def _file_digest(path: File) -> bytes:
+    with path.open("rb") as file:
+        return hashlib.file_digest(file, "sha256").digest()
+
+
+@dataclass
+class SyncReport:
+    """Statistics of :func:`sync_dir` run."""
+
+    copied_files: int = 0
+    copied_bytes: int = 0
+    skipped_files: int = 0
+    skipped_bytes: int = 0
+
+
+def _sync_file(source: File, dest: File, checksum: bool) -> tuple[bool, int]:
+    """Copies ``source`` to ``dest`` unless it's up to date there.
+
+    Returns:
+        whether file was copied and its size
+    """
+    source_stat = source.stat()
+    try:
+        dest_stat = dest.stat()
+    except FileNotFoundError:
+        dest_stat = None
+
+    if dest_stat is not None and dest_stat.st_size == source_stat.st_size:
+        if checksum:
+            if _file_digest(source) == _file_digest(dest):
+                return False, source_stat.st_size
+        elif int(dest_stat.st_mtime) == int(source_stat.st_mtime):
+            return False, source_stat.st_size
+
+    _fast_copy(source, dest)
+    shutil.copystat(source, dest)
+    return True, source_stat.st_size
+
+
+def _dir_key(path: PathLike) -> tuple[int, int]:
+    stat_result = os.stat(path)  # noqa: PTH116
+    return stat_result.st_dev, stat_result.st_ino
+
+
+def _is_cycle(
+    source: Directory, dest: Path, chain: set[tuple[int, int]], ancestors: dict
+) -> bool:
+    """Checks whether ``source`` directory is already on the walked way (to walk it otherwise).
+
+    Symlink to such directory is recreated in ``dest`` as a link instead of copying
+        the tree endlessly.
+    """
+    key = _dir_key(source)
+    if key not in chain:
+        ancestors[os.fspath(source)] = chain | {key}
+        return False
+    if source.is_symlink() and not dest.is_symlink():
+        dest.symlink_to(source.readlink(), target_is_directory=True)
+    return True
+
+
 @str2pathlib
-def cp(source: Path, dest: Path, parents: bool = True) -> Path:
+def sync_dir(
+    source: Directory, dest: Directory, *, checksum: bool = False, workers: int = 8
+) -> SyncReport:
+    """Incrementally copies directory tree, rsync-like.
+
+    Files with the same size and modification time (with one second precision)
+        in `dest` are considered up to date and skipped, others are copied in
+        parallel threads (with zero-copy syscalls where available) along with metadata.
+        Files existing only in `dest` are left untouched. Symlinked directories are
+        copied as directories, except links to their own ancestors (including ones
+        above `source`) or to `dest`, which are recreated as links.
+
+    Args:
+        source: directory to copy
+        dest: directory to copy to, created if needed
+        checksum: compare contents of files with the same size by sha256
+            instead of modification time (slower, but exact)
+        workers: number of threads copying files
+
+    Returns:
+        Numbers of copied and skipped files and bytes
+    """
+    dirs, tasks = [], []
+    dest.mkdir(parents=True, exist_ok=True)
+    # (st_dev, st_ino) of every directory on the way from `source` to the walked one,
+    # real ancestors of `source` and `dest` (never walked into)
+    chain = {_dir_key(path) for path in [source, dest, *source.resolve().parents]}
+    ancestors = {os.fspath(source): chain}
+    for root, dirnames, filenames in os.walk(source, followlinks=True):
+        relative = Path(root).relative_to(source)
+        (dest / relative).mkdir(parents=True, exist_ok=True)
+        dirs.append((Path(root), dest / relative))
+        tasks.extend((Path(root, name), dest / relative / name) for name in filenames)
+
+        chain = ancestors.pop(root)
+        dirnames[:] = [
+            name
+            for name in dirnames
+            if not _is_cycle(Path(root, name), dest / relative / name, chain, ancestors)
+        ]
+
+    report = SyncReport()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for was_copied, size in executor.map(lambda task: _sync_file(*task, checksum), tasks):
+            if was_copied:
+                report.copied_files += 1
+                report.copied_bytes += size
+            else:
+                report.skipped_files += 1
+                report.skipped_bytes += size
+
+    for source_dir, dest_dir in dirs:  # after files, as copying changes directory mtime
+        shutil.copystat(source_dir, dest_dir)
+    return report
+
+
+@str2pathlib
+def cp(source: Path, dest: Path, parents: bool = True, *, incremental: bool = False) -> Path:
     """Copies file or folder to destination for both strings and pathlib objects.
 
     Unfortunately pathlib doesn't have a native copying function =(((
+
+    Args:
+        source: file or directory to copy
+        dest: destination path
+        parents: create parent directories of `dest` for files
+        incremental: for directories copy only changed files (see :func:`sync_dir`)
     """
     if source.is_dir():
+        if incremental:
+            sync_dir(source, dest)
+            return dest
         copied = shutil.copytree(source, dest, dirs_exist_ok=True)
     else:
         if parents:
@@ -132,56 +767,425 @@ def cp(source: Path, dest: Path, parents: bool = True) -> Path:
     return Path(copied)
 
 
+_SUBTREES_PER_WORKER = 4
+_PARALLEL_RM_MAX_DEPTH = 3
+
+
+def _rmtree_parallel(folder: Directory, workers: int) -> None:
+    """Removes tree deleting its subtrees in parallel threads.
+
+    Top levels of the tree are expanded (deleting files on the way) until there are
+    enough subtrees to keep all workers busy.
+    """
+    expanded = []
+    subtrees = [folder]
+    for _ in range(_PARALLEL_RM_MAX_DEPTH):
+        if len(subtrees) >= workers * _SUBTREES_PER_WORKER:
+            break
+        next_level = []
+        for directory in subtrees:
+            expanded.append(directory)
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        next_level.append(Path(entry.path))
+                    else:
+                        Path(entry.path).unlink()
+        subtrees = next_level
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(shutil.rmtree, subtrees))
+    for directory in reversed(expanded):
+        directory.rmdir()
+
+
+def _rmtree(folder: Directory, workers: int) -> None:
+    if workers == 1:
+        shutil.rmtree(folder)
+    else:
+        _rmtree_parallel(folder, workers)
+
+
 @str2pathlib
-def rm_r(folder: Directory):
+def rm_r(folder: Directory, *, background: bool = False, workers: int = 1) -> Future | None:
     """Emulates `rm -r <folder>` command.
 
     Ignores not existing directory
+
+    Args:
+        folder: directory to remove
+        background: if True, `folder` is renamed to a hidden trash directory next to it
+            (which is instant) and removed in a background thread, so the function
+            returns immediately. Interpreter waits for removal to finish before exit.
+        workers: number of threads removing subtrees in parallel
+
+    Returns:
+        Future to wait for the background removal on (None if `background` is False)
+
+    Raises:
+        OSError: if `folder` is a symlink (as `shutil.rmtree` does), content of the
+            directory it points to is never touched
     """
+    if folder.is_symlink():
+        raise OSError(f"Cannot call rm_r on a symbolic link: {folder}")
+    if not background:
+        if folder.exists():
+            _rmtree(folder, workers)
+        return None
+
+    future = Future()
+    future.set_running_or_notify_cancel()
     if not folder.exists():
-        return
-    shutil.rmtree(folder)
+        future.set_result(None)
+        return future
+
+    trash = folder.with_name(f".{folder.name}.trash-{uuid.uuid4().hex}")
+    folder.rename(trash)
+
+    def remove():
+        try:
+            _rmtree(trash, workers)
+        except BaseException as exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(None)
+
+    threading.Thread(target=remove, name=f"rm_r-{folder.name}").start()
+    return future
+
+
+class _SizeWalker:
+    """Scans directories for :func:`dir_size`, safe to share between threads.
+
+    Files are deduplicated by ``(st_dev, st_ino)``: hardlinks are counted once and
+        so are files reachable both directly and through symlinks. Symlinks pointing
+        inside the root are skipped (their targets are counted by the walk itself),
+        external directories (including ancestors of the root) are visited once, which
+        also breaks symlink cycles, and the walk never re-enters the root from them.
+    """
+
+    def __init__(self, root: str, check_softlinks: bool):
+        self.root = os.path.realpath(root)
+        self.check_softlinks = check_softlinks
+        self.lock = threading.Lock()
+        self.seen_files: set[tuple[int, int]] = set()
+        # the root itself is never entered again from outside (e.g. by link to its ancestor)
+        self.visited_dirs: set[tuple[int, int]] = {_dir_key(self.root)}
+
+    def _inside_root(self, real_path: str) -> bool:
+        return real_path == self.root or real_path.startswith(self.root + os.sep)
+
+    def _first_visit(self, seen: set, stat_result: os.stat_result) -> bool:
+        key = (stat_result.st_dev, stat_result.st_ino)
+        with self.lock:
+            if key in seen:
+                return False
+            seen.add(key)
+            return True
+
+    def _scan_symlink(self, entry: os.DirEntry, subdirs: list) -> int:
+        target = os.path.realpath(entry.path)
+        if self._inside_root(target):
+            return 0
+        stat_result = os.stat(target)  # noqa: PTH116
+        if stat.S_ISDIR(stat_result.st_mode):
+            if self._first_visit(self.visited_dirs, stat_result):
+                subdirs.append((target, True, entry.path))
+        elif stat.S_ISREG(stat_result.st_mode) and self._first_visit(
+            self.seen_files, stat_result
+        ):
+            return stat_result.st_size
+        return 0
+
+    def _file_size(self, entry: os.DirEntry, outside: bool) -> int:
+        # `DirEntry.stat` is cached by scandir, but lacks inode on Windows
+        stat_result = entry.stat(follow_symlinks=False)
+        if stat_result.st_nlink > 1 or outside:
+            stat_result = os.stat(entry.path, follow_symlinks=False)  # noqa: PTH116
+            if not self._first_visit(self.seen_files, stat_result):
+                return 0
+        return stat_result.st_size
+
+    def scan(self, path: str, outside: bool) -> tuple[int, list[tuple[str, bool, str]]]:
+        """Sums sizes of files directly in ``path``.
+
+        Args:
+            path: directory to scan
+            outside: whether ``path`` is outside of the root (reached by symlink)
+
+        Returns:
+            total size in bytes and subdirectories as (path, outside, path to report)
+        """
+        size = 0
+        subdirs = []
+        try:
+            entries = os.scandir(path)
+        except OSError:  # e.g. permission denied or removed during the walk
+            return 0, []
+
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_symlink():
+                        if self.check_softlinks:
+                            size += self._scan_symlink(entry, subdirs)
+                    elif entry.is_dir(follow_symlinks=False):
+                        if not outside or self._first_visit(
+                            self.visited_dirs,
+                            os.stat(entry.path),  # noqa: PTH116
+                        ):
+                            subdirs.append((entry.path, outside, entry.path))
+                    elif entry.is_file(follow_symlinks=False):
+                        size += self._file_size(entry, outside)
+                except OSError:
+                    continue
+        return size, subdirs
 
 
 @str2pathlib
 def dir_size(
-    directory: Directory, units: str = "Bytes", check_softlinks: bool = True
-) -> float:
+    directory: Directory,
+    units: str = "b",
+    check_softlinks: bool = True,
+    *,
+    workers: int = 1,
+    breakdown: bool = False,
+) -> float | dict[Path, float]:
     """Calculates the total size of files within the directory.
 
+    Every file is counted once: hardlinks and files reachable by several symlinks
+        don't inflate the size and symlink cycles are detected.
+
     Args:
         directory: target directory
         units: size units (from .constants.SIZE_CONSTANTS.keys())
         check_softlinks: flag indicating whether to count files by links or not
+        workers: number of threads scanning subdirectories in parallel
+            (helps a lot on network and other high-latency file systems)
+        breakdown: if True, return sizes per immediate subdirectory instead of total
+
+    Returns:
+        Total size or dict mapping each immediate subdirectory (or symlink to it)
+            to its total size; files located directly in `directory` are reported
+            under `directory` key
     """
-    total_size = 0
-    for f in directory.glob("**/*"):
-        if f.is_file():
-            total_size += f.stat().st_size / SIZE_CONSTANTS[units]
-        if check_softlinks and f.is_symlink():
-            src = f.resolve()
-            total_size += dir_size(src, units)
-    return total_size
+    walker = _SizeWalker(str(directory), check_softlinks)
+    sizes = defaultdict(int)
+
+    def children(subdirs: list, label: str | None) -> list:
+        # immediate subdirectories of root become labels of everything below them
+        return [(path, outside, label or report) for path, outside, report in subdirs]
+
+    root_task = (str(directory), False, None)
+    if workers == 1:
+        stack = [root_task]
+        while stack:
+            path, outside, label = stack.pop()
+            size, subdirs = walker.scan(path, outside)
+            sizes[label] += size
+            stack.extend(children(subdirs, label))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = {executor.submit(walker.scan, *root_task[:2]): root_task[2]}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    label = pending.pop(future)
+                    size, subdirs = future.result()
+                    sizes[label] += size
+                    for path, outside, child_label in children(subdirs, label):
+                        pending[executor.submit(walker.scan, path, outside)] = child_label
+
+    unit = SIZE_CONSTANTS[units]
+    if not breakdown:
+        return sum(sizes.values()) / unit
+    return {
+        directory if label is None else Path(label): size / unit
+        for label, size in sizes.items()
+    }
+
+
+_DAY_SECONDS = 24 * 3600.0
+_STEP_PATTERN = re.compile(r"^\s*(\d+(?:\.\d*)?)\s*([a-z]+)\s*$")
+
+
+def _to_timedelta(step: timedelta | float | str) -> timedelta:
+    """Converts step given as timedelta, number of days or string like "15m" or "1.5h".
+
+    String units are the ones from .constants.TIME_CONSTANTS and "d" for days.
+    """
+    if isinstance(step, timedelta):
+        return step
+    if isinstance(step, int | float):
+        return timedelta(days=step)
+    match = _STEP_PATTERN.match(step)
+    units = TIME_CONSTANTS | {"d": _DAY_SECONDS}
+    if match is None or match[2] not in units:
+        raise ValueError(f"Unknown step {step!r}, expected number with one of {list(units)}")
+    return timedelta(seconds=float(match[1]) * units[match[2]])
+
+
+def _to_date(value: str | date) -> date:
+    if not isinstance(value, str):
+        return value
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        return datetime.fromisoformat(value)
+
+
+class DateRange(Sequence):
+    """Lazy range of dates (or datetimes) with constant step, analogue to ``range``.
+
+    Supports ``len``, indexing, slicing, ``in`` and ``reversed`` in O(1) time and memory.
+        Use :func:`daterange` to create one.
+    """
+
+    __slots__ = ("_length", "_start", "_step")
+
+    def __init__(self, start: date, step: timedelta, length: int):
+        """Creates range of `length` items: `start`, `start + step`, ...
+
+        Args:
+            start: first element
+            step: difference between consecutive elements, nonzero
+            length: number of elements
+        """
+        if not step:
+            raise ValueError("DateRange step must not be zero")
+        self._start = start
+        self._step = step
+        self._length = max(length, 0)
+
+    @property
+    def start(self) -> date:
+        return self._start
+
+    @property
+    def step(self) -> timedelta:
+        return self._step
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int | slice) -> "date | DateRange":
+        if isinstance(index, slice):
+            indices = range(self._length)[index]
+            return DateRange(
+                self._start + self._step * indices.start,
+                self._step * indices.step,
+                len(indices),
+            )
+        index = range(self._length)[index]  # normalizes negative and checks bounds
+        return self._start + self._step * index
+
+    def __iter__(self) -> Iterator[date]:
+        current, step = self._start, self._step
+        for _ in range(self._length):
+            yield current
+            current += step
+
+    def __reversed__(self) -> "DateRange":
+        return self[::-1]
+
+    def __contains__(self, item: object) -> bool:
+        if not isinstance(item, date) or isinstance(item, datetime) != isinstance(
+            self._start, datetime
+        ):
+            return False
+        try:
+            index, remainder = divmod(item - self._start, self._step)
+        except TypeError:  # e.g. naive and aware datetimes
+            return False
+        return not remainder and 0 <= index < self._length
+
+    def index(self, value: date, start: int = 0, stop: int | None = None) -> int:
+        if value in self:
+            index = (value - self._start) // self._step
+            if index in range(self._length)[start:stop]:
+                return index
+        raise ValueError(f"{value!r} is not in range")
+
+    def count(self, value: date) -> int:
+        return int(value in self)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, DateRange):
+            return NotImplemented
+        if self._length != other._length:
+            return False
+        if self._length == 0:
+            return True
+        return self._start == other._start and (self._length == 1 or self._step == other._step)
+
+    def __hash__(self) -> int:
+        # consistent with __eq__, as for ``range``
+        if self._length == 0:
+            return hash((0, None, None))
+        return hash((self._length, self._start, self._step if self._length > 1 else None))
+
+    def __repr__(self) -> str:
+        return f"DateRange(start={self._start!r}, step={self._step!r}, length={self._length})"
+
+    def to_numpy(self) -> "np.ndarray":
+        """Returns range as ``datetime64`` array built in one vectorized operation.
+
+        Dates give ``datetime64[D]`` (if step is whole days), datetimes give
+            ``datetime64[us]``; timezone-aware datetimes are converted to naive UTC.
+        """
+        start = self._start
+        if isinstance(start, datetime):
+            if start.tzinfo is not None:
+                start = start.astimezone(UTC).replace(tzinfo=None)
+            unit = "us"
+        else:
+            unit = "D" if self._step % timedelta(days=1) == timedelta(0) else "us"
+        np = importlib.import_module("numpy")
+        step = np.timedelta64(self._step, "us").astype(f"timedelta64[{unit}]")
+        return np.datetime64(start, unit) + np.arange(self._length) * step
+
+    def to_polars(self, name: str = ""):
+        """Returns range as polars ``Date`` or ``Datetime`` Series (polars is optional)."""
+        polars = importlib.import_module("polars")
+        return polars.Series(name, self.to_numpy())
 
 
 def daterange(
-    start_date: str | datetime,
-    end_date: str | datetime,
+    start_date: str | date,
+    end_date: str | date,
     *,
     include_last: bool = False,
-) -> Iterator[date]:
-    """Generates dates in requested range.
+    step: timedelta | float | str = 1,
+) -> DateRange:
+    """Range of dates from `start_date` to `end_date` (excluded by default) with `step`.
+
+    Result is a lazy sequence with O(1) ``len``, indexing, slicing and ``in``
+        (see :class:`DateRange`), which can be exported to numpy in one call.
+
+    Args:
+        start_date: first date; strings are parsed as ISO dates or datetimes
+        end_date: last date
+        include_last: include `end_date` itself if it falls on a step
+        step: timedelta, number of days or string like "6h" or "15m"
+            (units from .constants.TIME_CONSTANTS and "d"), may be negative
 
     Note:
         Date format is ISO: 'yyyy-mm-dd'
     """
-    if isinstance(start_date, str):
-        start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
-    if isinstance(end_date, str):
-        end_date = datetime.strptime(end_date, "%Y-%m-%d").date()
-    days = (end_date - start_date).days
-    if include_last:
-        days += 1
+    start_date, end_date = _to_date(start_date), _to_date(end_date)
+    if isinstance(start_date, datetime) != isinstance(end_date, datetime):
+        start_date, end_date = (
+            value
+            if isinstance(value, datetime)
+            else datetime.combine(value, datetime.min.time())
+            for value in (start_date, end_date)
+        )
+    step = _to_timedelta(step)
+    if not isinstance(start_date, datetime) and step % timedelta(days=1):
+        raise ValueError(f"Step of date range must be a whole number of days, got {step}")
+    if not step:
+        raise ValueError("daterange() step must not be zero")
 
-    for i in range(days):
-        yield start_date + timedelta(i)
+    count, remainder = divmod(end_date - start_date, step)
+    length = count + 1 if include_last or remainder else count
+    return DateRange(start_date, step, length)
@@ -1,10 +1,15 @@
-from collections.abc import Sequence
+import importlib
+import os
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 import cv2
-import matplotlib.pyplot as plt
-from matplotlib import patches
+import numpy as np
 
-from .typing import Array, Bbox, Number, OpencvFlag
+from .boxes import Boxes
+from .general import str2pathlib
+from .typing import Array, Bbox, Directory, File, Number, OpencvFlag, PathLike
 
 
 def resize(
@@ -19,63 +24,385 @@ def resize(
     Args:
         image: an image to resize
         inter: Interpolation flags, [see here](https://docs.opencv.org/4.5.5/da/d54/group__imgproc__transform.html#ga5bb5a1fea74ea38e1a5445ca803ff121)
+            (`cv2.INTER_AREA` if None)
         height: required height
         width: required width
 
     Returns:
         resized image (new one)
     """
-    inter = inter or cv2.INTER_AREA
-    orig_height, orig_width = image.shape[:2]
+    inter = cv2.INTER_AREA if inter is None else inter
+    dsize = _target_size(image.shape, height, width)
+    return cv2.resize(image, dsize, interpolation=inter)
+
+
+def _target_size(
+    shape: tuple[int, ...], height: Number | None, width: Number | None
+) -> tuple[int, int]:
+    """Returns (width, height) for `cv2.resize` keeping aspect ratio if one is missing."""
+    orig_height, orig_width = shape[:2]
 
     if width is not None and height is not None:
-        dsize = (width, height)
-    elif height is not None:
+        return (width, height)
+    if height is not None:
         ratio = height / float(orig_height)
-        dsize = (int(orig_width * ratio), height)
-    elif width is not None:
+        return (int(orig_width * ratio), height)
+    if width is not None:
         ratio = width / float(orig_width)
-        dsize = (width, int(orig_height * ratio))
+        return (width, int(orig_height * ratio))
+    raise ValueError("At least one of `height` and `width` must be specified!")
+
+
+def _batch_target_size(
+    images: Sequence[Array], height: Number | None, width: Number | None
+) -> tuple[int, int]:
+    """Returns common target size of images computing it once per distinct shape."""
+    if isinstance(images, np.ndarray):
+        kinds = {(images.shape[1:], images.dtype)}
     else:
-        raise ValueError("At least one of `height` and `width` must be specified!")
+        kinds = {(image.shape, image.dtype) for image in images}
+    if len({(shape[2:], dtype) for shape, dtype in kinds}) > 1:
+        raise ValueError("All images must have the same number of channels and dtype")
 
-    return cv2.resize(image, dsize, interpolation=inter)
+    sizes = {_target_size(shape, height, width) for shape, _ in kinds}
+    if len(sizes) > 1:
+        raise ValueError(
+            "Images of different aspect ratios are resized to different sizes, "
+            "specify both `height` and `width`"
+        )
+    return sizes.pop()
+
+
+def resize_batch(
+    images: Sequence[Array] | Array,
+    inter: OpencvFlag | None = None,
+    *,
+    height: Number | None = None,
+    width: Number | None = None,
+    out: Array | None = None,
+    workers: int = 8,
+) -> Array:
+    """Resizes many images at once in several threads (OpenCV releases GIL).
+
+    Args:
+        images: list of images or stacked array of them in (N, H, W[, C]) format
+        inter: same as in `resize`
+        height: required height
+        width: required width
+        out: array to write results to (e.g. the result of previous call to reuse it),
+            new one is allocated if not given
+        workers: number of threads
+
+    Returns:
+        `out` or new array with resized images in (N, height, width[, C]) format
+    """
+    if not len(images):
+        raise ValueError("No images to resize")
+    inter = cv2.INTER_AREA if inter is None else inter
+    dsize = _batch_target_size(images, height, width)
+    first = images[0]
+    expected = (len(images), dsize[1], dsize[0], *first.shape[2:])
+    if out is None:
+        out = np.empty(expected, dtype=first.dtype)
+    elif out.shape != expected or out.dtype != first.dtype:
+        raise ValueError(f"`out` of {expected} shape and {first.dtype} type expected")
+
+    def resize_range(start: int, stop: int):
+        for i in range(start, stop):
+            cv2.resize(images[i], dsize, dst=out[i], interpolation=inter)
+
+    _run_ranges(resize_range, len(images), workers)
+    return out
+
+
+def _run_ranges(func: Callable[[int, int], None], total: int, workers: int) -> None:
+    """Calls ``func(start, stop)`` for contiguous ranges of ``range(total)`` in threads.
+
+    One range per thread rather than a task per item keeps the overhead negligible.
+    """
+    workers = max(1, min(workers, total))
+    if workers == 1:
+        func(0, total)
+        return
+    bounds = np.linspace(0, total, workers + 1).astype(int)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(func, bounds[:-1], bounds[1:]))
+
+
+_IMAGE_SUFFIXES = frozenset((".bmp", ".jpeg", ".jpg", ".png", ".tif", ".tiff", ".webp"))
+_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}  # not DHT, JPG and DAC
+_REDUCED_FLAGS = {
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+
+def _jpeg_size(path: File) -> tuple[int, int] | None:
+    """Reads (height, width) from JPEG header without decoding, None for other files."""
+    with path.open("rb") as file:
+        if file.read(2) != b"\xff\xd8":
+            return None
+        while len(marker := file.read(2)) == 2 and marker[0] == 0xFF:  # noqa: PLR2004
+            length = int.from_bytes(file.read(2), "big")
+            if marker[1] in _SOF_MARKERS:
+                frame_header = file.read(5)  # precision, height, width
+                if len(frame_header) < 5:  # noqa: PLR2004
+                    return None
+                return (
+                    int.from_bytes(frame_header[1:3], "big"),
+                    int.from_bytes(frame_header[3:5], "big"),
+                )
+            file.seek(length - 2, os.SEEK_CUR)
+    return None
+
+
+def _reduction(size: tuple[int, int], dsize: tuple[int, int]) -> int:
+    """Returns the largest JPEG decoder downscale keeping image not smaller than `dsize`.
+
+    EXIF orientation may swap sides of decoded image, so each side must cover both
+    target sides.
+    """
+    for factor in (8, 4, 2):
+        if min(size) // factor >= max(dsize):
+            return factor
+    return 1
+
+
+@str2pathlib
+def read_image(
+    path: File,
+    *,
+    height: Number | None = None,
+    width: Number | None = None,
+    opencv_format: bool = False,
+    out: Array | None = None,
+) -> Array:
+    """Reads colour image, optionally resizing it like `resize` does.
+
+    JPEG images are decoded right at 1/2, 1/4 or 1/8 resolution when the target size
+    permits, which is several times faster than decoding in full and resizing.
+
+    Args:
+        path: image file
+        height: required height
+        width: required width
+        opencv_format: return BGR image (as OpenCV does), else RGB;
+            same convention as `plot_image` has
+        out: array to write the image to
+
+    Returns:
+        `out` or new image in (H, W, 3) format
+    """
+    factor, size = 1, None
+    if height is not None or width is not None:
+        size = _jpeg_size(path)
+        if size is not None:
+            factor = _reduction(size, _target_size(size, height, width))
+
+    image = cv2.imread(path.as_posix(), _REDUCED_FLAGS.get(factor, cv2.IMREAD_COLOR))
+    if image is None:
+        raise ValueError(f"Can't read image {path}")
 
+    if height is not None or width is not None:
+        if size is None or (size[0] > size[1]) != (image.shape[0] > image.shape[1]):
+            size = image.shape  # unknown or rotated by EXIF orientation
+        dsize = _target_size(size, height, width)
+        if out is not None and out.shape[:2] != dsize[::-1]:
+            raise ValueError(f"Image {path} is resized to {dsize[::-1]}, not {out.shape[:2]}")
+        image = cv2.resize(image, dsize, dst=out, interpolation=cv2.INTER_AREA)
+    elif out is not None:
+        if out.shape != image.shape:
+            raise ValueError(
+                f"Image {path} of shape {image.shape} given, {out.shape} expected"
+            )
+        out[...] = image
+        image = out
 
-def plot_image(
+    if not opencv_format:
+        cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=image)
+    return image
+
+
+@str2pathlib
+def read_images(
+    images: Directory | Sequence[PathLike],
+    *,
+    height: Number | None = None,
+    width: Number | None = None,
+    opencv_format: bool = False,
+    workers: int = 8,
+) -> Array:
+    """Reads many images in several threads and stacks them (see `read_image`).
+
+    Args:
+        images: list of image files, directory to read all images from or single file
+        height: required height
+        width: required width
+        opencv_format: return BGR images (as OpenCV does), else RGB
+        workers: number of threads
+
+    Returns:
+        Images in (N, H, W, 3) format; if sizes of images differ both `height` and
+            `width` must be given
+    """
+    if isinstance(images, Path):
+        if images.is_dir():
+            paths = sorted(
+                path for path in images.iterdir() if path.suffix.lower() in _IMAGE_SUFFIXES
+            )
+        elif images.is_file():
+            paths = [images]
+        else:
+            raise FileNotFoundError(f"No such image or directory: {images}")
+    else:
+        paths = [Path(path) for path in images]
+    if not paths:
+        raise ValueError(f"No images to read in {images}")
+
+    kwargs = {"height": height, "width": width, "opencv_format": opencv_format}
+    first = read_image(paths[0], **kwargs)
+    out = np.empty((len(paths), *first.shape), dtype=first.dtype)
+    out[0] = first
+
+    def read_range(start: int, stop: int):
+        for i in range(max(start, 1), stop):
+            read_image(paths[i], **kwargs, out=out[i])
+
+    _run_ranges(read_range, len(paths), workers)
+    return out
+
+
+def _downsample(image: Array, max_width: float, max_height: float) -> Array:
+    """Shrinks image to fit into the given number of pixels (no-op if it fits)."""
+    height, width = image.shape[:2]
+    scale = min(max_width / width, max_height / height)
+    if scale >= 1:
+        return image
+    if image.dtype.kind in "uf":
+        dsize = (max(1, round(width * scale)), max(1, round(height * scale)))
+        return cv2.resize(image, dsize, interpolation=cv2.INTER_AREA)
+    step = int(np.ceil(1 / scale))  # e.g. bool masks OpenCV can't resize
+    return image[::step, ::step]
+
+
+def _box_outlines(boxes: Sequence[Bbox] | Array | Boxes) -> Array:
+    """Converts (N, 4) 'tlbr' boxes to (N, 5, 2) closed polylines for LineCollection."""
+    if isinstance(boxes, Boxes):
+        boxes = boxes.convert("tlbr").data
+    x1, y1, x2, y2 = np.asarray(boxes, dtype=float).reshape(-1, 4).T
+    return np.stack(
+        [
+            np.stack(corner, axis=-1)
+            for corner in ((x1, y1), (x2, y1), (x2, y2), (x1, y2), (x1, y1))
+        ],
+        axis=1,
+    )
+
+
+def _show_image(
+    ax,
+    image: Array,
+    title: str,
+    boxes: Sequence[Bbox] | Array | Boxes,
+    opencv_format: bool,
+    max_pixels: tuple[float, float] | None,
+):
+    collections = importlib.import_module("matplotlib.collections")
+
+    height, width = image.shape[:2]
+    if max_pixels is not None:
+        image = _downsample(image, *max_pixels)
+    if opencv_format:  # to reverse colours from BGR
+        image = image[..., ::-1]
+    # extent keeps coordinates of the original image, so boxes (and anything drawn
+    # by the user) don't need rescaling after downsampling
+    ax.imshow(image, extent=(-0.5, width - 0.5, height - 0.5, -0.5))
+    ax.set_title(title)
+    outlines = _box_outlines(boxes)
+    if len(outlines):
+        ax.add_collection(collections.LineCollection(outlines, colors="r", linewidths=1))
+
+
+def plot_image(  # noqa: PLR0913
     image: "Array",
     title: str = "",
-    boxes: Sequence[Bbox] = (),
+    boxes: Sequence[Bbox] | Array | Boxes = (),
     figsize: tuple = (20, 5),
     opencv_format: bool = False,
     extra_operations=lambda: None,
+    *,
+    downsample: bool = True,
 ):
     """Plots image with optional bboxes on it.
 
     Args:
         image: an image to plot
         title: title for plotter imgae
-        boxes: list of bboxes in 'tlbr' format
+        boxes: list of bboxes or (N, 4) array in 'tlbr' format or `Boxes` of any format,
+            drawn as a single collection, so thousands of boxes are fine;
             remember that matplotlib's coordinates x is horizontal, y is vertical
         figsize: size in inches e.g. (12, 6)
         opencv_format: channels sequence from opencv (BGR), so it need to be reversed
         extra_operations: lambda with everything you want to do to plt
+        downsample: shrink image to the pixel size of the figure before plotting
+            (axes keep coordinates of the original image)
     """
-    if opencv_format:  # to reverse colours from BGR
-        image = image[..., ::-1]
+    # matplotlib is imported here as it takes longer than everything else in the module
+    plt = importlib.import_module("matplotlib.pyplot")
 
-    plt.figure(figsize=figsize, constrained_layout=True)
-    plt.imshow(image)
-    plt.title(title)
-    for box in boxes:
-        rect = patches.Rectangle(
-            (box[0], box[1]),
-            box[2] - box[0],
-            box[3] - box[1],
-            linewidth=1,
-            edgecolor="r",
-            facecolor="none",
-        )
-        plt.gca().add_patch(rect)
+    figure = plt.figure(figsize=figsize, constrained_layout=True)
+    max_pixels = tuple(figure.get_size_inches() * figure.dpi) if downsample else None
+    _show_image(plt.gca(), image, title, boxes, opencv_format, max_pixels)
+    extra_operations()
+    plt.show()
+
+
+def plot_images(  # noqa: PLR0913
+    images: Sequence[Array],
+    titles: Sequence[str] | None = None,
+    boxes: Sequence[Sequence[Bbox] | Array | Boxes] | None = None,
+    *,
+    ncols: int = 4,
+    figsize: tuple | None = None,
+    opencv_format: bool = False,
+    extra_operations=lambda: None,
+    downsample: bool = True,
+):
+    """Plots images in a grid, analogue to `plot_image` for many images.
+
+    Args:
+        images: images to plot
+        titles: title for every image
+        boxes: bboxes for every image (see `plot_image`)
+        ncols: number of columns of the grid
+        figsize: size in inches, by default 5 inches per image
+        opencv_format: channels sequence from opencv (BGR), so it need to be reversed
+        extra_operations: lambda with everything you want to do to plt
+        downsample: shrink images to the pixel size of grid cells before plotting
+    """
+    plt = importlib.import_module("matplotlib.pyplot")
+
+    ncols = max(1, min(ncols, len(images)))
+    nrows = -(-len(images) // ncols)
+    figure, axes = plt.subplots(
+        nrows,
+        ncols,
+        figsize=figsize or (5 * ncols, 5 * nrows),
+        constrained_layout=True,
+        squeeze=False,
+    )
+    max_pixels = None
+    if downsample:
+        width, height = figure.get_size_inches() * figure.dpi
+        max_pixels = (width / ncols, height / nrows)
+
+    for i, ax in enumerate(axes.flat):
+        if i >= len(images):
+            ax.set_axis_off()
+            continue
+        title = titles[i] if titles is not None else ""
+        image_boxes = boxes[i] if boxes is not None else ()
+        _show_image(ax, images[i], title, image_boxes, opencv_format, max_pixels)
     extra_operations()
     plt.show()
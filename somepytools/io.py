@@ -1,27 +1,235 @@
+import copy
+import functools
+import gzip
+import importlib
+import importlib.util
 import json
+import re
+import threading
+import tomllib
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from datetime import date, time
+from types import MappingProxyType, ModuleType
+from typing import IO, Any
 
-from .general import str2pathlib
+from .constants import SIZE_CONSTANTS
+from .general import _open_zstd, str2pathlib
 from .typing import File, JsonSerializable
 
+_IMMUTABLE_TYPES = frozenset((str, bytes, int, float, bool, type(None), date, time))
+
+
+def _copy_data(value: Any) -> Any:
+    """Deep copy specialized for parsed configs, much faster than ``copy.deepcopy``."""
+    immutable = _IMMUTABLE_TYPES
+    if type(value) is dict:
+        return {
+            key: item if type(item) in immutable else _copy_data(item)
+            for key, item in value.items()
+        }
+    if type(value) is list:
+        return [item if type(item) in immutable else _copy_data(item) for item in value]
+    if type(value) in immutable:
+        return value
+    return copy.deepcopy(value)
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively makes data read-only: dicts to mappings, lists to tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list | tuple):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+class ParseCache:
+    """Thread-safe LRU cache of parsed files keyed by ``(resolved path, mtime_ns, size)``.
+
+    Pass it as ``cache`` argument to `read_json`, `read_yaml` or `read_toml`, so files
+    not changed since the last read aren't parsed again. Size of the cache is accounted
+    by sizes of cached files. Copying cached data is roughly as fast as parsing JSON with
+    orjson, so for JSON the gain comes with ``immutable=True`` only.
+
+    Example:
+        cache = ParseCache(max_size=16, units="Mb")
+        config = read_yaml("config.yaml", cache=cache)
+        cache.stats()
+
+        >>> {"hits": 0, "misses": 1, "evictions": 0, "entries": 1, "size": 1234}
+    """
+
+    def __init__(self, max_size: float = 64, units: str = "Mb", *, immutable: bool = False):
+        """Creates empty cache.
+
+        Args:
+            max_size: maximal total size of cached files in `units`
+            units: size units (from .constants.SIZE_CONSTANTS.keys())
+            immutable: if True, cached data is returned as read-only view (dicts become
+                ``MappingProxyType``, lists become tuples) shared between callers,
+                else each caller gets its own deep copy
+        """
+        self.max_size = max_size * SIZE_CONSTANTS[units]
+        self.immutable = immutable
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, filename: File, parser: Hashable, parse: Callable[[], Any]) -> Any:
+        """Returns parsed content of `filename`, calling ``parse()`` on cache miss.
+
+        Args:
+            filename: file to read
+            parser: identifier of parser (data parsed differently is cached separately)
+            parse: function parsing `filename`
+        """
+        stat_result = filename.stat()
+        key = (str(filename.resolve()), stat_result.st_mtime_ns, stat_result.st_size, parser)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if entry is None:
+            data = parse()
+            entry = (_freeze(data) if self.immutable else data, stat_result.st_size)
+            self._put(key, entry)
+        # the cached object itself is never given away unless it is read-only
+        return entry[0] if self.immutable else _copy_data(entry[0])
+
+    def _put(self, key: Hashable, entry: tuple[Any, int]) -> None:
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = entry
+            self._size += entry[1]
+            while self._size > self.max_size and len(self._entries) > 1:
+                _, (_, size) = self._entries.popitem(last=False)
+                self._size -= size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict[str, int]:
+        """Returns counters for monitoring: hits, misses, evictions, entries and size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "size": self._size,
+            }
+
+
+def _cached(cache: ParseCache | None, filename: File, parser: Hashable, parse: Callable):
+    return parse() if cache is None else cache.get(filename, parser, parse)
+
+
+# Parsers are ordered from the fastest to the slowest, "auto" backend picks the first
+# installed one. Fast JSON parsers don't support some stdlib extensions (NaN, Infinity,
+# integers beyond 64 bits), such documents are reparsed with stdlib for identical output.
+_JSON_DECODERS: dict[str, Callable[[bytes], Any]] = {}
+# exception raised by the decoder on unsupported document (not a ValueError in every version)
+_JSON_DECODE_ERRORS: dict[str, type[Exception]] = {}
+_JSON_ENCODERS: dict[str, Callable[[Any], bytes]] = {}
+
+try:
+    import orjson
+
+    _JSON_DECODERS["orjson"] = orjson.loads
+    _JSON_DECODE_ERRORS["orjson"] = orjson.JSONDecodeError
+    _JSON_ENCODERS["orjson"] = orjson.dumps
+except ModuleNotFoundError:
+    pass
+
+try:
+    import msgspec
+
+    _JSON_DECODERS["msgspec"] = msgspec.json.decode
+    _JSON_DECODE_ERRORS["msgspec"] = msgspec.DecodeError
+    _JSON_ENCODERS["msgspec"] = msgspec.json.encode
+except ModuleNotFoundError:
+    pass
+
+_JSON_DECODERS["json"] = json.loads
+_JSON_DECODE_ERRORS["json"] = ValueError
+_JSON_ENCODERS["json"] = lambda data: json.dumps(data).encode()
+
+
+def _pick_backend(backend: str, available: dict[str, Any], auto: str | None = None) -> str:
+    """Resolves "auto" backend to the fastest available one and checks explicit choice.
+
+    Args:
+        backend: requested backend name or "auto"
+        available: available backends, fastest first
+        auto: backend to use for "auto" instead of the fastest one
+    """
+    if backend == "auto":
+        return auto or next(iter(available))
+    if backend not in available:
+        raise ValueError(
+            f"Backend {backend!r} is not available, installed ones are: {list(available)}"
+        )
+    return backend
+
 
 @str2pathlib
-def read_json(filename: File, **kwargs) -> JsonSerializable:
+def read_json(
+    filename: File, *, backend: str = "auto", cache: ParseCache | None = None, **kwargs
+) -> JsonSerializable:
     """Reads data from json-file.
 
     Args:
         filename: name of the json-file.
-        **kwargs: arguments from ``json.load()`` method.
+        backend: parser to use - "orjson", "msgspec" or "json" (stdlib).
+            By default the fastest installed one is used.
+        cache: cache to take data from if file wasn't changed since it was parsed
+            (not used when `kwargs` are given)
+        **kwargs: arguments from ``json.load()`` method (imply stdlib backend).
 
     Returns:
         Data from json-file.
     """
-    with filename.open() as file:
-        return json.load(file, **kwargs)
+    if kwargs:
+        return _load_json(filename, backend, kwargs)
+    return _cached(cache, filename, ("json", backend), lambda: _load_json(filename, backend))
+
+
+def _load_json(filename: File, backend: str, kwargs: dict | None = None) -> JsonSerializable:
+    if kwargs and backend not in {"auto", "json"}:
+        raise ValueError(f"json.load() arguments are not supported by {backend!r} backend")
+    if kwargs or backend == "json":
+        with filename.open() as file:
+            return json.load(file, **(kwargs or {}))
+
+    backend = _pick_backend(backend, _JSON_DECODERS)
+    content = filename.read_bytes()
+    try:
+        return _JSON_DECODERS[backend](content)
+    except _JSON_DECODE_ERRORS[backend]:
+        return json.loads(content)
 
 
 @str2pathlib
 def write_json(
-    data: JsonSerializable, filename: File, *, newline: bool = False, **kwargs
+    data: JsonSerializable,
+    filename: File,
+    *,
+    newline: bool = False,
+    backend: str = "auto",
+    **kwargs,
 ) -> File:
     """Writes dictionary to json-file.
 
@@ -30,13 +238,24 @@ def write_json(
         filename: name of the json-file. Empty extension will be replaced with .json
         newline: to put neline symbol at the end of the file or not
             (needed to avoid `pre-commit` trigger on autogenerated files)
-        **kwargs: arguments from ``json.dump()`` method.
+        backend: serializer to use - "orjson", "msgspec" or "json" (stdlib).
+            Fast ones write compact UTF-8 json which differs from stdlib formatting,
+            so "auto" keeps stdlib for identical output.
+        **kwargs: arguments from ``json.dump()`` method (imply stdlib backend).
 
     Returns:
         Path to saved file (may differ in suffix from original)
     """
     if not len(filename.suffix):
         filename = filename.with_suffix(".json")
+
+    backend = _pick_backend(backend, _JSON_ENCODERS, auto="json")
+    if backend != "json":
+        if kwargs:
+            raise ValueError(f"json.dump() arguments are not supported by {backend!r} backend")
+        filename.write_bytes(_JSON_ENCODERS[backend](data) + (b"\n" if newline else b""))
+        return filename
+
     with filename.open("w") as file:
         json.dump(data, file, **kwargs)
         if newline:
@@ -44,53 +263,275 @@ def write_json(
     return filename
 
 
-try:
-    import yaml
+def _open_compressed(filename: File, mode: str) -> IO:
+    """Opens file compressing or decompressing it on the fly based on .gz or .zst suffix."""
+    encoding = None if "b" in mode else "utf-8"
+    if filename.suffix == ".gz":
+        return gzip.open(filename, mode, encoding=encoding)
+    if filename.suffix != ".zst":
+        return filename.open(mode, encoding=encoding)
+    return _open_zstd(filename, mode, encoding)
+
+
+@str2pathlib
+def iter_jsonl(filename: File, *, backend: str = "auto") -> Iterator[JsonSerializable]:
+    """Lazily reads JSON Lines file record by record, empty lines are skipped.
+
+    Files with .gz and .zst suffixes are decompressed on the fly.
+
+    Args:
+        filename: name of the jsonl-file
+        backend: parser to use, same as in `read_json`
+    """
+    backend = _pick_backend(backend, _JSON_DECODERS)
+    decode, decode_error = _JSON_DECODERS[backend], _JSON_DECODE_ERRORS[backend]
+    with _open_compressed(filename, "rb") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            try:
+                yield decode(line)
+            except decode_error:
+                yield json.loads(line)
+
+
+@str2pathlib
+def write_jsonl(
+    records: Iterable[JsonSerializable],
+    filename: File,
+    *,
+    backend: str = "auto",
+    batch_size: int = 1000,
+) -> File:
+    """Writes records to JSON Lines file, one compact json per line.
+
+    Records are consumed lazily and written in batches, so generators of any length
+    can be saved. Files with .gz and .zst suffixes are compressed on the fly.
+
+    Args:
+        records: iterable of json-serializable objects
+        filename: name of the jsonl-file
+        backend: serializer to use, same as in `write_json`
+        batch_size: number of records joined into one write call
+
+    Returns:
+        Path to saved file
+    """
+    backend = _pick_backend(backend, _JSON_ENCODERS, auto="json")
+    if backend == "json":
+        encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    else:
+        encode = _JSON_ENCODERS[backend]
+
+    with _open_compressed(filename, "wb") as file:
+        batch = []
+        for record in records:
+            line = encode(record)
+            batch.append(line.encode() if isinstance(line, str) else line)
+            if len(batch) >= batch_size:
+                batch.append(b"")  # to end the last line with a newline
+                file.write(b"\n".join(batch))
+                batch = []
+        if batch:
+            batch.append(b"")
+            file.write(b"\n".join(batch))
+    return filename
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# the longest token the decoder may fail on or stop early in when it is cut by the
+# end of the buffer ("-Infinity", "\uXXXX" escape, exponent of a number)
+_MAX_TOKEN = 9
+
+
+class _JsonArrayReader:
+    """Incremental parser of a top-level JSON array keeping only a small window in memory."""
+
+    def __init__(self, file: IO[str], chunk_size: int, decoder: json.JSONDecoder):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = decoder
+        self.buffer = ""
+        self.pos = 0
+        # characters and lines dropped from the buffer and offset of the last line start
+        self.consumed = self.lines = self.line_start = 0
+
+    def _fill(self) -> bool:
+        """Drops consumed part of the buffer and reads next chunk.
+
+        Chunk grows with the buffer, so huge elements are parsed in linear time.
+        At the end of file returns False and leaves the buffer untouched.
+        """
+        chunk = self.file.read(max(self.chunk_size, len(self.buffer) - self.pos))
+        if not chunk:
+            return False
+        dropped = self.buffer[: self.pos]
+        if (newlines := dropped.count("\n")) > 0:
+            self.lines += newlines
+            self.line_start = self.consumed + dropped.rindex("\n") + 1
+        self.consumed += len(dropped)
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Skips whitespace and returns next character ("" at the end of file)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def _error(self, msg: str, pos: int) -> json.JSONDecodeError:
+        """Makes error at ``pos`` of the buffer with position counted from the file start."""
+        error = json.JSONDecodeError(msg, self.buffer, pos)
+        if error.lineno == 1:
+            error.colno += self.consumed - self.line_start
+        error.lineno += self.lines
+        error.pos += self.consumed
+        error.args = (f"{msg}: line {error.lineno} column {error.colno} (char {error.pos})",)
+        return error
+
+    def _near_end(self, pos: int) -> bool:
+        return pos > len(self.buffer) - _MAX_TOKEN
+
+    def _value(self) -> JsonSerializable:
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as exc:
+                # only errors caused by the value cut by the chunk end are worth reading more,
+                # others are raised right away not to read the rest of the file into memory
+                cut = exc.msg.startswith("Unterminated string") or self._near_end(exc.pos)
+                if cut and self._fill():
+                    continue
+                raise self._error(exc.msg, exc.pos) from None
+            # a number or a literal cut by the chunk end may continue in the next chunk
+            if self._near_end(end) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def _expect(self, expected: str) -> str:
+        char = self._peek()
+        if not char or char not in expected:
+            raise self._error(f"Expected one of {list(expected)} in top-level array", self.pos)
+        self.pos += 1
+        return char
+
+    def __iter__(self) -> Iterator[JsonSerializable]:
+        self._expect("[")
+        if self._peek() == "]":
+            self.pos += 1
+        else:
+            yield self._value()
+            while self._expect(",]") == ",":
+                yield self._value()
+        if self._peek():
+            raise self._error("Extra data", self.pos)
+
+
+@str2pathlib
+def iter_json_array(
+    filename: File, *, chunk_size: int = 1 << 16, **kwargs
+) -> Iterator[JsonSerializable]:
+    """Lazily reads elements of top-level array from json-file.
+
+    Memory usage doesn't depend on the file size, only on the size of a single element.
+    Files with .gz and .zst suffixes are decompressed on the fly.
+
+    Args:
+        filename: name of the json-file
+        chunk_size: number of characters read from the file at once
+        **kwargs: arguments of ``json.JSONDecoder`` (e.g. ``object_hook``)
+
+    Raises:
+        json.JSONDecodeError: if file content isn't a valid JSON array
+    """
+    with _open_compressed(filename, "rt") as file:
+        yield from _JsonArrayReader(file, chunk_size, json.JSONDecoder(**kwargs))
+
+
+# yaml and toml are optional and imported only on the first use to keep `io` import cheap,
+# functions working with them are defined only if the packages are installed.
+if importlib.util.find_spec("yaml") is not None:
+
+    @functools.cache
+    def _yaml_backends() -> tuple[ModuleType, dict[str, type], dict[str, type]]:
+        """Imports yaml and returns it with loaders and dumpers, fastest first."""
+        yaml = importlib.import_module("yaml")
+        # libyaml bindings are much faster than pure Python implementation
+        # and produce identical results
+        loaders = {"pyyaml": yaml.SafeLoader}
+        dumpers = {"pyyaml": yaml.SafeDumper}
+        if yaml.__with_libyaml__:
+            loaders = {"libyaml": yaml.CSafeLoader, **loaders}
+            dumpers = {"libyaml": yaml.CSafeDumper, **dumpers}
+        return yaml, loaders, dumpers
 
     @str2pathlib
-    def read_yaml(filename: File) -> JsonSerializable:
+    def read_yaml(
+        filename: File, *, backend: str = "auto", cache: ParseCache | None = None
+    ) -> JsonSerializable:
         """Reads YAML file.
 
-        analogue to `read_json`
+        analogue to `read_json`, `backend` is "libyaml" (used if available) or "pyyaml"
         """
-        with filename.open() as file:
-            return yaml.safe_load(file)
+        yaml, loaders, _ = _yaml_backends()
+        loader = loaders[_pick_backend(backend, loaders)]
+
+        def load():
+            with filename.open() as file:
+                return yaml.load(file, Loader=loader)
+
+        return _cached(cache, filename, ("yaml", backend), load)
 
     @str2pathlib
-    def write_yaml(data: JsonSerializable, filename: File, **kwargs) -> File:
+    def write_yaml(
+        data: JsonSerializable, filename: File, *, backend: str = "auto", **kwargs
+    ) -> File:
         """Writes YAML file.
 
-        analogue to `write_json`
+        analogue to `write_json`, `backend` is "libyaml" (used if available) or "pyyaml"
         """
+        yaml, _, dumpers = _yaml_backends()
+        dumper = dumpers[_pick_backend(backend, dumpers)]
         with filename.open("w") as file:
-            yaml.safe_dump(data, file, **kwargs)
+            yaml.dump(data, file, Dumper=dumper, **kwargs)
         return filename
 
-except ModuleNotFoundError:
-    pass
 
+_TOML_LOADERS: dict[str, Callable[[str], Any]] = {"tomllib": tomllib.loads}
 
-try:
-    import toml
-
-    @str2pathlib
-    def read_toml(filename: File) -> JsonSerializable:
-        """Reads TOML file.
-
-        analogue to `read_json`
-        """
-        with filename.open() as file:
-            return toml.load(file)
+if importlib.util.find_spec("toml") is not None:
+    _TOML_LOADERS["toml"] = lambda text: importlib.import_module("toml").loads(text)
 
     @str2pathlib
     def write_toml(data: JsonSerializable, filename: File) -> File:
-        """Writes YAML file.
+        """Writes TOML file.
 
         analogue to `write_json`
         """
+        toml = importlib.import_module("toml")
         with filename.open("w") as file:
             toml.dump(data, file)
         return filename
 
-except ModuleNotFoundError:
-    pass
+
+@str2pathlib
+def read_toml(
+    filename: File, *, backend: str = "auto", cache: ParseCache | None = None
+) -> JsonSerializable:
+    """Reads TOML file.
+
+    analogue to `read_json`, `backend` is "tomllib" (stdlib, default) or "toml"
+    """
+    loads = _TOML_LOADERS[_pick_backend(backend, _TOML_LOADERS)]
+
+    def load():
+        with filename.open() as file:
+            return loads(file.read())
+
+    return _cached(cache, filename, ("toml", backend), load)
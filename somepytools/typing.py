@@ -1,13 +1,16 @@
-"""Single place to define (and redefine) custom types."""
+"""Single place to define (and redefine) custom types.
 
+Types based on heavy optional libraries (numpy, torch) are resolved lazily on the first
+access, so importing this module (and modules using it for annotations) stays cheap.
+"""
+
+import importlib
 import os
 from collections.abc import Sequence
 from numbers import Number
 from pathlib import Path
 from typing import Any, TypeVar
 
-import numpy as np
-
 # Path which is expected to be directory (dir.is_dir() == True)
 Directory = Path
 # Path which is expected to be file (dir.is_dir() == False)
@@ -24,32 +27,53 @@ OpencvFlag = int
 # This is supposed to be some data type for multidimensional array libraries as numpy or torch
 Dtype = TypeVar("Dtype")
 
+# Single bounding box, many of them are better kept in `somepytools.boxes.Boxes`
 Bbox = Sequence[Number]
-"""Numpy array of type `Dtype`.
 
-`Dtype` can be any regular numeric type such as `int`, `bool` or numpy types as `np.float32`
-"""
 
-Array = np.ndarray
+def _numpy_types() -> dict[str, Any]:
+    numpy = importlib.import_module("numpy")
+    return {
+        # Numpy array of type `Dtype`.
+        # `Dtype` can be any regular numeric type such as `int`, `bool` or numpy types as
+        # `np.float32`
+        "Array": numpy.ndarray,
+    }
+
+
+def _torch_types() -> dict[str, Any]:
+    try:
+        torch = importlib.import_module("torch")
+    except ModuleNotFoundError:
+        return dict.fromkeys(("Device", "LooseDevice", "Model", "Tensor"))
+    return {
+        # Hardware type for torch
+        "Device": torch.device,
+        # Weakened version accepting string as well as Device
+        "LooseDevice": str | torch.device,
+        "Model": torch.nn.Module,
+        # Torch tensor of type `Dtype`.
+        # `Dtype` can be any regular numeric type such as `int`, `bool` or torch types as
+        # `torch.float32`
+        "Tensor": torch.Tensor,
+    }
+
 
-try:
-    import torch
+_LAZY_TYPES = {
+    "Array": _numpy_types,
+    "Device": _torch_types,
+    "LooseDevice": _torch_types,
+    "Model": _torch_types,
+    "Tensor": _torch_types,
+}
 
-    # Hardware type for torch
-    Device = torch.device
-    # Weakened version accepting string as well as Device
-    LooseDevice = str | torch.device
-    Model = torch.nn.Module
-    """Torch tensor of type `Dtype`.
 
-    `Dtype` can be any regular numeric type such as `int`, `bool` or torch types as
-    `torch.float32`
-    """
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_TYPES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals().update(_LAZY_TYPES[name]())  # next accesses don't get here
+    return globals()[name]
 
-    Tensor = torch.Tensor
 
-except ModuleNotFoundError:
-    Device = None
-    LooseDevice = None
-    Model = None
-    Tensor = None
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY_TYPES})
@@ -1,12 +1,23 @@
-from collections.abc import Iterable, Sequence
-from contextlib import contextmanager
+import functools
+import importlib
+import itertools
+import os
+import queue
+import threading
+import zipfile
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Union
+from typing import Any, Union
 
 import cv2
+import numpy as np
 
 from .general import str2pathlib
-from .typing import Array, File
+from .typing import Array, Directory, File
 
 
 @contextmanager
@@ -50,9 +61,117 @@ def open_video(video_path: File, mode: str = "r", *args):
         video.release()
 
 
+class VideoWriter:
+    """Streaming video writer encoding frames in a background thread.
+
+    Frames are colour converted (or copied) into one of `queue_size` reused buffers
+    right in `write`, so the caller can reuse its frames as soon as `write` returns,
+    while encoding of previous frames runs concurrently. Errors of the encoder are
+    raised by the next `write` (and every one after it) or by `close`.
+
+    Example:
+        with VideoWriter("out.avi", fps=25) as writer:
+            for frame in frames:
+                writer.write(frame)
+    """
+
+    @str2pathlib
+    def __init__(
+        self,
+        video_path: File,
+        codec_code: str = "XVID",
+        fps: int = 2,
+        is_color: bool = True,
+        *,
+        queue_size: int = 8,
+    ):
+        """Prepares writer, the file is opened on the first frame (to know its size).
+
+        Args:
+            video_path: The name of the file to save the video to.
+            codec_code: FourCC - a 4-byte code used to specify the video codec.
+            fps: Framerate of the created video stream.
+            is_color: RGB images or not.
+            queue_size: number of frames which may wait for encoding
+        """
+        self.video_path = video_path
+        self.is_color = is_color
+        self.queue_size = queue_size
+        self._fourcc = cv2.VideoWriter_fourcc(*codec_code)
+        self._fps = fps
+        self._stack = ExitStack()
+        self._ready = queue.Queue()  # converted frames waiting for encoder
+        self._free = queue.Queue()  # buffers to convert next frames to
+        self._thread = None
+        self._error = None
+        self._error_reported = False
+        self._closed = False
+
+    def _start(self, frame: Array) -> None:
+        height, width = frame.shape[:2]
+        writer = self._stack.enter_context(
+            open_video(
+                self.video_path, "w", self._fourcc, self._fps, (width, height), self.is_color
+            )
+        )
+        for _ in range(self.queue_size):
+            self._free.put(np.empty(frame.shape, frame.dtype))
+        self._thread = threading.Thread(
+            target=self._encode, args=(writer,), name="somepytools-encoder", daemon=True
+        )
+        self._thread.start()
+
+    def _encode(self, writer: "cv2.VideoWriter") -> None:
+        while (buffer := self._ready.get()) is not None:
+            if self._error is None:  # after failure buffers are just recycled
+                try:
+                    writer.write(buffer)
+                except BaseException as exc:  # re-raised by the producer
+                    self._error = exc
+            self._free.put(buffer)
+
+    def write(self, frame: Array) -> None:
+        """Adds RGB (or binary if not `is_color`) frame to the video."""
+        if self._closed:
+            raise ValueError(f"Writer of {self.video_path} is closed")
+        if self._error is not None:
+            self._error_reported = True
+            raise self._error
+        if self._thread is None:
+            self._start(frame)
+
+        buffer = self._free.get()
+        if frame.shape != buffer.shape:
+            self._free.put(buffer)
+            raise ValueError(f"Frame of shape {frame.shape} given, {buffer.shape} expected")
+        if self.is_color:
+            cv2.cvtColor(frame, cv2.COLOR_RGB2BGR, dst=buffer)
+        else:
+            np.copyto(buffer, frame)
+        self._ready.put(buffer)
+
+    def close(self) -> None:
+        """Waits for all frames to be encoded and closes the file."""
+        self._closed = True
+        if self._thread is not None:
+            self._ready.put(None)
+            self._thread.join()
+            self._thread = None
+        self._stack.close()
+        if self._error is not None and not self._error_reported:
+            self._error_reported = True
+            raise self._error
+
+    def __enter__(self) -> "VideoWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
 @str2pathlib
 def write_video(
-    images: Sequence[Array],
+    images: Iterable[Array],
     video_path: File,
     codec_code: str = "XVID",
     fps: int = 2,
@@ -60,45 +179,444 @@ def write_video(
 ):
     """Writes images to video file by given path.
 
+    Images are consumed lazily and encoded in a background thread (see `VideoWriter`),
+    so any iterable (e.g. generator) of any length can be written.
+
     Args:
-        images: List of RGB or binary images.
+        images: Iterable of RGB or binary images.
         video_path: The name of the file to save the video to.
         codec_code: FourCC - a 4-byte code used to specify the video codec.
         fps: Framerate of the created video stream.
         is_color: RGB images or not.
     """
-    fourcc = cv2.VideoWriter_fourcc(*codec_code)
-    height, width, _ = images[0].shape
-    with open_video(video_path, "w", fourcc, fps, (width, height), is_color) as capture:
+    with VideoWriter(video_path, codec_code, fps, is_color) as writer:
         for frame in images:
-            if is_color:
-                frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)  # noqa: PLW2901
-            capture.write(frame)
+            writer.write(frame)
+
+
+_END = object()
+
+
+def _read_frames(capture: "cv2.VideoCapture", rgb: bool) -> Iterator[Array]:
+    while True:
+        retval, frame = capture.read()
+        if not retval:
+            return
+        if rgb:  # in place, so frame stays C-contiguous (unlike frame[:, :, ::-1] view)
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+        yield frame
+
+
+def _prefetch(items: Iterator, size: int) -> Iterator:  # noqa: C901
+    """Iterates `items` in a background thread keeping up to `size` of them ready.
+
+    Exception raised by `items` is re-raised in the consumer; if the consumer stops
+    early the thread is stopped and joined before return.
+    """
+    ready = queue.Queue(maxsize=size)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                ready.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put((item, None)):
+                    return
+            put((_END, None))
+        except BaseException as exc:  # re-raised by the consumer
+            put((_END, exc))
+
+    thread = threading.Thread(target=produce, name="somepytools-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = ready.get()
+            if error is not None:
+                raise error
+            if item is _END:
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
 
 
 @str2pathlib
-def frames(video: Union[File, "cv2.VideoCapture"], rgb: bool = True) -> Iterable[Array]:
+def frames(
+    video: Union[File, "cv2.VideoCapture"], rgb: bool = True, *, prefetch: int = 0
+) -> Iterable[Array]:
     """Generator of frames from the video provided.
 
     Args:
         video: either Path or Video capture to read frames from
             in former case file will be opened with :py:funct:`.open_video`
         rgb: if True returns RGB image, else BGR - native to opencv format
+        prefetch: if positive, frames are decoded in a background thread up to
+            this number of frames ahead of the consumer (OpenCV releases GIL while
+            decoding, so decoding overlaps with processing of previous frames)
 
     Yields:
-        Frames of video in (H, W, C) format
+        C-contiguous frames of video in (H, W, C) format
     """
     if isinstance(video, (Path, str)):
         with open_video(video) as capture:
-            yield from frames(capture, rgb)
+            yield from frames(capture, rgb, prefetch=prefetch)
+    elif prefetch > 0:
+        yield from _prefetch(_read_frames(video, rgb), prefetch)
     else:
-        while True:
-            retval, frame = video.read()
-            if not retval:
-                break
-            if rgb:
-                frame = frame[:, :, ::-1]
-            yield frame
+        yield from _read_frames(video, rgb)
+
+
+def _skip_frames(capture: "cv2.VideoCapture", count: int) -> bool:
+    """Skips `count` frames without decoding them, False if video ended."""
+    return all(capture.grab() for _ in range(count))
+
+
+@str2pathlib
+def frame_batches(  # noqa: C901
+    video: Union[File, "cv2.VideoCapture"],
+    batch_size: int = 32,
+    rgb: bool = True,
+    *,
+    step: int = 1,
+    dtype: np.dtype | type | None = None,
+) -> Iterator[Array]:
+    """Generator of frames from the video stacked in batches.
+
+    Frames are decoded directly into one preallocated buffer which is yielded again
+    and again, so copy the batch if you need it after the next iteration.
+
+    Args:
+        video: either Path or Video capture to read frames from
+            in former case file will be opened with :py:funct:`.open_video`
+        batch_size: number of frames in batch (the last one may be smaller)
+        rgb: if True returns RGB image, else BGR - native to opencv format
+        step: take every `step`-th frame, others are skipped without decoding
+        dtype: type of batch, e.g. np.float32 (values aren't rescaled), default uint8
+
+    Yields:
+        Batches of frames in (N, H, W, C) format
+    """
+    if step < 1:
+        raise ValueError(f"`step` must be a positive integer, got {step}")
+    if isinstance(video, (Path, str)):
+        with open_video(video) as capture:
+            yield from frame_batches(capture, batch_size, rgb, step=step, dtype=dtype)
+        return
+
+    retval, staging = video.read()
+    if not retval:
+        return
+    batch = np.empty((batch_size, *staging.shape), dtype=dtype or staging.dtype)
+    # frames of batch dtype are decoded right into the batch, others are converted
+    # from the `staging` frame
+    direct = batch.dtype == staging.dtype
+    frame, size = staging, 0
+    while True:
+        if rgb:
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+        if frame is staging:
+            batch[size] = staging
+        size += 1
+        if size == batch_size:
+            yield batch
+            size = 0
+
+        if not _skip_frames(video, step - 1):
+            break
+        frame = batch[size] if direct else staging
+        retval, decoded = video.read(frame)
+        if not retval:
+            break
+        if decoded.ctypes.data != frame.ctypes.data:  # wasn't decoded in place
+            if decoded.shape != frame.shape:
+                raise ValueError(f"Frame size changed from {frame.shape} to {decoded.shape}")
+            frame[...] = decoded
+
+    if size:
+        yield batch[:size]
+
+
+_TIMESTAMP_TOLERANCE_MS = 1e-3
+
+
+@dataclass(frozen=True)
+class FrameIndex:
+    """Positions of all frames of a video.
+
+    Attributes:
+        timestamps: presentation time of every frame in milliseconds
+        keyframes: sorted numbers of frames decoding can start from (always has 0)
+    """
+
+    timestamps: Array
+    keyframes: Array
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def keyframe_before(self, frame: int) -> int:
+        """Returns the closest keyframe not after `frame`."""
+        return int(self.keyframes[np.searchsorted(self.keyframes, frame, side="right") - 1])
+
+
+def _scan_frames(video_path: File) -> FrameIndex:
+    """Builds index reading only packets of the video (no decoding when backend allows)."""
+    timestamps, is_key = [], []
+    with open_video(video_path) as capture:
+        raw = capture.set(cv2.CAP_PROP_FORMAT, -1)  # packets instead of decoded frames
+        while capture.grab():
+            timestamps.append(capture.get(cv2.CAP_PROP_POS_MSEC))
+            # if keyframes are unknown, rely on backend seeking (verified by timestamps)
+            is_key.append(not raw or bool(capture.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME)))
+
+    # packets come in decoding order, frames are decoded in presentation order
+    order = np.argsort(timestamps, kind="stable")
+    keyframes = np.flatnonzero(np.array(is_key, dtype=bool)[order])
+    if not len(keyframes) or keyframes[0] != 0:
+        keyframes = np.insert(keyframes, 0, 0)
+    return FrameIndex(np.array(timestamps, dtype=np.float64)[order], keyframes)
+
+
+@str2pathlib
+def frame_index(
+    video_path: File, index_path: File | None = None, *, cache: bool = True
+) -> FrameIndex:
+    """Builds index of video frames for random access (see `IndexedVideo`).
+
+    Index is stored in a sidecar file and rebuilt only when size or modification time
+    of the video change.
+
+    Args:
+        video_path: video to index
+        index_path: where to store the index, `<video name>.index.npz` near the video
+            by default
+        cache: if False, index is always rebuilt and not stored
+    """
+    stat_result = video_path.stat()
+    key = np.array([stat_result.st_size, stat_result.st_mtime_ns], dtype=np.int64)
+    index_path = index_path or video_path.with_name(f"{video_path.name}.index.npz")
+
+    if cache and index_path.exists():
+        try:
+            with np.load(index_path) as saved:
+                if np.array_equal(saved["stat"], key):
+                    return FrameIndex(saved["timestamps"], saved["keyframes"])
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            pass  # broken index is rebuilt
+
+    index = _scan_frames(video_path)
+    if cache:
+        tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+        try:
+            with tmp_path.open("wb") as file:
+                np.savez(
+                    file, stat=key, timestamps=index.timestamps, keyframes=index.keyframes
+                )
+            tmp_path.replace(index_path)
+        except OSError:  # e.g. read-only directory, index is just not cached
+            tmp_path.unlink(missing_ok=True)
+    return index
+
+
+class IndexedVideo:
+    """Random access to frames of a video file.
+
+    Uses `frame_index` to seek to the closest keyframe and decode forward from it,
+    landing position is verified by frame timestamps (if the backend seeks imprecisely,
+    frames are decoded from the start instead). Requests going forward within one group
+    of pictures continue decoding without seeking.
+
+    Example:
+        with IndexedVideo("video.mp4") as video:
+            frame = video.get_frame(100)
+            first, last = video.get_frames([0, -1])
+    """
+
+    @str2pathlib
+    def __init__(
+        self,
+        video_path: File,
+        rgb: bool = True,
+        *,
+        index_path: File | None = None,
+        cache: bool = True,
+        index: FrameIndex | None = None,
+    ):
+        """Opens the video and builds (or loads) its index.
+
+        Args:
+            video_path: video to read
+            rgb: if True returns RGB image, else BGR - native to opencv format
+            index_path: see `frame_index`
+            cache: see `frame_index`
+            index: already built index of the video, `index_path` and `cache`
+                are ignored if given
+        """
+        self.video_path = video_path
+        self.rgb = rgb
+        if index is None:
+            index = frame_index(video_path, index_path, cache=cache)
+        self.index = index
+        self._stack = ExitStack()
+        self._seekable = True
+        self._open()
+
+    def _open(self) -> None:
+        self._stack.close()
+        self._capture = self._stack.enter_context(open_video(self.video_path))
+        self._next = 0  # number of frame to be grabbed next
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def close(self) -> None:
+        self._stack.close()
+
+    def __enter__(self) -> "IndexedVideo":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _move_to(self, frame: int) -> bool:
+        """Positions the capture before `frame`, returns True if seeking was used."""
+        keyframe = self.index.keyframe_before(frame)
+        if keyframe <= self._next <= frame:
+            return False
+        if self._seekable:
+            self._capture.set(cv2.CAP_PROP_POS_FRAMES, keyframe)
+            self._next = keyframe
+            return True
+        if self._next > frame:
+            self._open()
+        return False
+
+    def _grab(self, frame: int) -> None:
+        """Grabs frames up to `frame` inclusive."""
+        seeked = self._move_to(frame)
+        while self._next <= frame:
+            if not self._capture.grab():
+                raise ValueError(f"{self.video_path} ended before frame {frame}")
+            timestamp = self._capture.get(cv2.CAP_PROP_POS_MSEC)
+            if abs(timestamp - self.index.timestamps[self._next]) > _TIMESTAMP_TOLERANCE_MS:
+                if not seeked:
+                    raise ValueError(f"{self.video_path} doesn't match its frame index")
+                self._seekable = seeked = False
+                self._open()
+                continue
+            self._next += 1
+
+    def get_frame(self, frame: int) -> Array:
+        """Returns frame by its number (negative numbers count from the end)."""
+        frame = range(len(self))[frame]
+        self._grab(frame)
+        retval, image = self._capture.retrieve()
+        if not retval:
+            raise ValueError(f"Failed to decode frame {frame} of {self.video_path}")
+        if self.rgb:
+            cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=image)
+        return image
+
+    def get_frames(self, frames: Iterable[int]) -> list[Array]:
+        """Returns frames by their numbers, each frame is decoded once in file order."""
+        frames = [range(len(self))[frame] for frame in frames]
+        decoded = {frame: self.get_frame(frame) for frame in sorted(set(frames))}
+        return [decoded[frame] for frame in frames]
+
+
+_worker_video: IndexedVideo | None = None
+
+
+def _open_worker_video(video_path: str, rgb: bool, index: FrameIndex) -> None:
+    global _worker_video  # noqa: PLW0603 - one capture per worker process
+    _worker_video = IndexedVideo(video_path, rgb, index=index)
+
+
+def _map_segment(fn: Callable[[Array], Any], start: int, stop: int) -> list:
+    return [fn(_worker_video.get_frame(frame)) for frame in range(start, stop)]
+
+
+@str2pathlib
+def map_frames(
+    video_path: File,
+    fn: Callable[[Array], Any],
+    workers: int | None = None,
+    *,
+    rgb: bool = True,
+    segment_size: int = 256,
+    cache: bool = True,
+) -> Iterator[Any]:
+    """Applies `fn` to every frame of the video in parallel processes.
+
+    Video is split into segments of consecutive frames, each segment is decoded and
+    processed by a worker (segment start is found with `IndexedVideo`). Results are
+    yielded in the order of frames and only ``2 * workers`` segments are processed
+    at once, so memory usage doesn't depend on video length. To save the results as
+    a video, pass the generator to `write_video`.
+
+    Args:
+        video_path: video to process
+        fn: function to apply to each frame, must be picklable (e.g. module-level)
+        workers: number of processes, all CPUs by default; with 1 everything
+            runs in the current process
+        rgb: if True `fn` receives RGB frames, else BGR - native to opencv format
+        segment_size: number of frames processed by a worker at once
+        cache: see `frame_index`
+
+    Yields:
+        ``fn(frame)`` for every frame of the video
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield from map(fn, frames(video_path, rgb))
+        return
+
+    # index is built once here and sent to workers instead of rebuilding it in each
+    index = frame_index(video_path, cache=cache)
+    n_frames = len(index)
+    segments = (
+        (start, min(start + segment_size, n_frames))
+        for start in range(0, n_frames, segment_size)
+    )
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_open_worker_video,
+        initargs=(str(video_path), rgb, index),
+    ) as executor:
+        pending = deque(
+            executor.submit(_map_segment, fn, start, stop)
+            for start, stop in itertools.islice(segments, 2 * workers)
+        )
+        try:
+            while pending:
+                results = pending.popleft().result()
+                for start, stop in itertools.islice(segments, 1):
+                    pending.append(executor.submit(_map_segment, fn, start, stop))
+                yield from results
+        finally:
+            for future in pending:  # consumer stopped early or worker failed
+                future.cancel()
+
+
+@functools.lru_cache(maxsize=4096)
+def _count_frames(video_path: str, size: int, mtime_ns: int) -> int:
+    """Counts frames with `grab` only, size and mtime are to invalidate cache."""
+    with open_video(video_path) as video:
+        # raw mode reads packets without decoding them (if supported by backend)
+        video.set(cv2.CAP_PROP_FORMAT, -1)
+        count = 0
+        while video.grab():
+            count += 1
+    return count
 
 
 @str2pathlib
@@ -109,16 +627,88 @@ def get_meta(video_path: File, count_frames: bool = True):
 
     Args:
         video_path: video to get info from
-        count_frames: if True - reads frames from video and count them
-            Warning: can be long to execute on big files
+        count_frames: if True - counts frames in video without decoding them
+            (result is cached until the file changes)
     """
     with open_video(video_path) as video:
-        real_frame_count = sum(1 for _ in frames(video)) if count_frames else None
-        return {
+        meta = {
             "width": video.get(cv2.CAP_PROP_FRAME_WIDTH),
             "height": video.get(cv2.CAP_PROP_FRAME_HEIGHT),
             "fps": video.get(cv2.CAP_PROP_FPS),
             "fourcc": video.get(cv2.CAP_PROP_FOURCC),
             "frame_count_meta": video.get(cv2.CAP_PROP_FRAME_COUNT),
-            "frame_count": real_frame_count,
+            "frame_count": None,
         }
+    if count_frames:
+        stat_result = video_path.stat()
+        meta["frame_count"] = _count_frames(
+            str(video_path.resolve()), stat_result.st_size, stat_result.st_mtime_ns
+        )
+    return meta
+
+
+_VIDEO_SUFFIXES = frozenset(
+    (".avi", ".flv", ".m4v", ".mkv", ".mov", ".mp4", ".mpeg", ".mpg", ".webm", ".wmv")
+)
+_META_FLOATS = ("width", "height", "fps", "fourcc", "frame_count_meta")
+
+
+def _meta_row(video_path: str, count_frames: bool) -> tuple:
+    try:
+        meta = get_meta(video_path, count_frames)
+    except (ValueError, cv2.error) as exc:
+        return (video_path, *[np.nan] * len(_META_FLOATS), -1, str(exc))
+    frame_count = -1 if meta["frame_count"] is None else meta["frame_count"]
+    return (video_path, *(meta[name] for name in _META_FLOATS), frame_count, "")
+
+
+@str2pathlib
+def collect_meta(
+    directory: Directory,
+    count_frames: bool = True,
+    *,
+    suffixes: Iterable[str] = _VIDEO_SUFFIXES,
+    workers: int | None = None,
+    as_polars: bool = False,
+):
+    """Extracts `get_meta` of all videos in the directory (recursively) in parallel.
+
+    Args:
+        directory: where to look for videos
+        count_frames: same as in `get_meta`
+        suffixes: extensions of video files (lowercase)
+        workers: number of processes, all CPUs by default
+        as_polars: return polars DataFrame instead of numpy array (polars is optional)
+
+    Returns:
+        Numpy structured array (one column per `get_meta` key plus "path" and "error")
+            sorted by path. Videos failed to open have NaN in float columns, -1 frame
+            count and non-empty error; -1 frame count also means it wasn't counted.
+    """
+    suffixes = set(suffixes)
+    paths = sorted(
+        str(path) for path in directory.rglob("*") if path.suffix.lower() in suffixes
+    )
+    read_row = functools.partial(_meta_row, count_frames=count_frames)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(paths) <= 1:
+        rows = list(map(read_row, paths))
+    else:
+        # several chunks per worker to balance load with small IPC overhead
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rows = list(executor.map(read_row, paths, chunksize=chunksize))
+
+    path_len = max((len(row[0]) for row in rows), default=1)
+    error_len = max((len(row[-1]) for row in rows), default=1)
+    dtype = [
+        ("path", f"U{path_len}"),
+        *((name, np.float64) for name in _META_FLOATS),
+        ("frame_count", np.int64),
+        ("error", f"U{max(error_len, 1)}"),
+    ]
+    table = np.array(rows, dtype=dtype)
+    if as_polars:
+        polars = importlib.import_module("polars")
+        return polars.DataFrame({name: table[name] for name in table.dtype.names})
+    return table
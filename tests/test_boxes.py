@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+
+from somepytools import boxes
+from somepytools.boxes import Boxes
+
+TLBR = np.array([[0, 0, 10, 20], [5, 10, 15, 20], [20, 20, 21, 22]], dtype=float)
+
+
+def greedy_nms(tlbr, scores, threshold, classes=None):
+    """Classic one box at a time NMS as a reference."""
+    iou = Boxes(tlbr).iou(Boxes(tlbr))
+    if classes is not None:
+        iou = np.where(classes[:, None] == classes[None], iou, 0)
+    suppressed = np.zeros(len(tlbr), dtype=bool)
+    kept = []
+    for index in np.argsort(-scores, kind="stable"):
+        if not suppressed[index]:
+            kept.append(index)
+            suppressed |= iou[index] > threshold
+    return np.array(kept, dtype=np.intp)
+
+
+def test_formats():
+    xywh = Boxes(TLBR).convert("xywh")
+    np.testing.assert_array_equal(xywh.data[1], [5, 10, 10, 10])
+    cxcywh = xywh.convert("cxcywh")
+    np.testing.assert_array_equal(cxcywh.data[0], [5, 10, 10, 20])
+    np.testing.assert_array_equal(cxcywh.convert("tlbr").data, TLBR)
+    np.testing.assert_array_equal(cxcywh.area, [200, 100, 2])
+    assert Boxes(TLBR).convert("tlbr").data is TLBR
+
+    assert Boxes().data.shape == (0, 4)
+    assert Boxes([[1, 2, 3, 4]]).data.dtype == np.float64
+    with pytest.raises(ValueError, match="format"):
+        Boxes(TLBR, "xyxy")
+    with pytest.raises(ValueError, match="shape"):
+        Boxes([1, 2, 3])
+
+
+def test_indexing():
+    items = Boxes(TLBR, "xywh")
+    assert len(items[1]) == 1
+    assert items[1].fmt == "xywh"
+    np.testing.assert_array_equal(items[items.area < 400].data, TLBR[:2])  # noqa: PLR2004
+    np.testing.assert_array_equal(np.asarray(items[[2, 0]]), TLBR[[2, 0]])
+
+
+def test_clip_and_rescale():
+    clipped = Boxes(TLBR).convert("xywh").clip(height=21, width=12)
+    assert clipped.fmt == "xywh"
+    np.testing.assert_array_equal(clipped.data[:, 2:], [[10, 20], [7, 10], [0, 1]])
+
+    frame, resized = (40, 60, 3), (20, 15)
+    scaled = Boxes(TLBR).convert("cxcywh").rescale(frame, resized).convert("tlbr")
+    np.testing.assert_allclose(scaled.data[0], [0, 0, 2.5, 10])
+
+
+def test_iou():
+    iou = Boxes(TLBR).iou(Boxes(TLBR[:2]).convert("cxcywh"))
+    assert iou.shape == (3, 2)
+    np.testing.assert_allclose(iou[:, 0], [1, 50 / 250, 0])
+    np.testing.assert_array_equal(Boxes([[1, 1, 1, 1]]).iou(Boxes([[1, 1, 1, 1]])), [[0]])
+
+
+@pytest.mark.parametrize("block", [(256, 8192), (1, 7)])
+@pytest.mark.parametrize("threshold", [0, 0.3, 0.7])
+def test_nms_matches_greedy(monkeypatch, block, threshold):
+    monkeypatch.setattr(boxes, "_NMS_BLOCK", block)
+    rng = np.random.default_rng(0)
+    n = 500
+    sizes = rng.uniform(0, 40, (n, 2)) * rng.choice([0.2, 1, 4], (n, 1))
+    items = Boxes(np.concatenate([rng.uniform(-50, 300, (n, 2)), sizes], axis=1), "xywh")
+    scores = rng.integers(0, 100, n)  # with ties
+    classes = rng.integers(0, 3, n)
+    tlbr = items.convert("tlbr").data
+
+    np.testing.assert_array_equal(
+        items.nms(scores, threshold), greedy_nms(tlbr, scores, threshold)
+    )
+    np.testing.assert_array_equal(
+        items.nms(scores, threshold, classes), greedy_nms(tlbr, scores, threshold, classes)
+    )
+
+
+def test_nms_edge_cases():
+    assert len(Boxes().nms([])) == 0
+    np.testing.assert_array_equal(Boxes(TLBR).nms([1, 3, 2], 0.1), [1, 2])
+    np.testing.assert_array_equal(Boxes(TLBR[[0, 0]]).nms([1, 1]), [0])
+    with pytest.raises(ValueError, match="scores"):
+        Boxes(TLBR).nms([1, 2])
+
+
+def test_nms_bounds_cells_per_box(monkeypatch):
+    rng = np.random.default_rng(0)
+    tiny = np.concatenate([rng.uniform(0, 400, (300, 2)), rng.uniform(1, 3, (300, 2))], axis=1)
+    items = Boxes(np.r_[tiny, [[200, 200, 4000, 4000]]], "cxcywh")
+    scores = rng.uniform(0, 1, len(items))
+    cover = boxes._cover
+
+    def bounded_cover(columns, cell):
+        box, keys = cover(columns, cell)
+        assert np.bincount(box, minlength=columns.shape[1]).max(initial=0) <= 4  # noqa: PLR2004
+        return box, keys
+
+    monkeypatch.setattr(boxes, "_cover", bounded_cover)
+    np.testing.assert_array_equal(
+        items.nms(scores, 0.0), greedy_nms(items.convert("tlbr").data, scores, 0.0)
+    )
@@ -0,0 +1,211 @@
+import importlib
+import io
+import tarfile
+import zipfile
+from concurrent.futures import Future
+from pathlib import Path
+
+import pytest
+
+from somepytools import drives
+from somepytools import io as sp_io
+from somepytools.drives import unzip
+
+CONTENT = b"some useful data " * 1000
+
+
+def _make_zip(path, names, compression=zipfile.ZIP_STORED):
+    with zipfile.ZipFile(path, "w", compression=compression) as zf:
+        for name in names:
+            zf.writestr(name, CONTENT)
+    return path
+
+
+def test_unzip_extracts_members(tmp_path):
+    zip_path = _make_zip(tmp_path / "data.zip", ["a.txt", "dir/b.txt"])
+    unzip(zip_path, tmp_path / "out", verbose=False)
+
+    assert (tmp_path / "out" / "a.txt").read_bytes() == CONTENT
+    assert (tmp_path / "out" / "dir" / "b.txt").read_bytes() == CONTENT
+
+
+def test_unzip_rejects_path_traversal(tmp_path):
+    zip_path = _make_zip(tmp_path / "data.zip", ["a.txt", "../evil.txt"])
+    with pytest.raises(ValueError, match="Unsafe ZIP member path"):
+        unzip(zip_path, tmp_path / "out", verbose=False)
+
+    assert not (tmp_path / "evil.txt").exists()
+    assert not (tmp_path / "out" / "a.txt").exists()
+
+
+def test_unzip_removes_corrupted_member(tmp_path):
+    zip_path = _make_zip(tmp_path / "data.zip", ["a.txt"])
+    raw = bytearray(zip_path.read_bytes())
+    raw[raw.index(CONTENT) + 100] ^= 0xFF  # damage stored data, CRC stays the same
+    zip_path.write_bytes(raw)
+
+    with pytest.raises(ValueError, match="Corrupted ZIP member"):
+        unzip(zip_path, tmp_path / "out", verbose=False)
+
+    assert not (tmp_path / "out" / "a.txt").exists()
+
+
+def test_unzip_removes_corrupted_deflated_member(tmp_path):
+    zip_path = _make_zip(tmp_path / "data.zip", ["a.txt"], compression=zipfile.ZIP_DEFLATED)
+    with zipfile.ZipFile(zip_path) as zf:
+        (member,) = zf.infolist()
+    raw = bytearray(zip_path.read_bytes())
+    data_start = member.header_offset + 30 + len(member.filename)  # after local header
+    raw[data_start] = 0xFF  # invalid deflate block type makes zlib fail
+    zip_path.write_bytes(raw)
+
+    with pytest.raises(ValueError, match="Corrupted ZIP member"):
+        unzip(zip_path, tmp_path / "out", verbose=False)
+
+    assert not (tmp_path / "out" / "a.txt").exists()
+
+
+def test_unzip_parallel(tmp_path):
+    names = [f"dir_{i % 3}/file_{i}.txt" for i in range(50)]
+    zip_path = _make_zip(tmp_path / "data.zip", names)
+    unzip(zip_path, tmp_path / "out", verbose=False, workers=3)
+
+    assert sorted(names) == sorted(
+        path.relative_to(tmp_path / "out").as_posix()
+        for path in (tmp_path / "out").rglob("*.txt")
+    )
+    assert all((tmp_path / "out" / name).read_bytes() == CONTENT for name in names)
+
+    with pytest.raises(ValueError, match="workers"):
+        unzip(zip_path, tmp_path / "other", verbose=False, workers=-1)
+    assert not (tmp_path / "other").exists()
+
+
+class _LocalGdown:
+    """Stand-in for `gdown` module serving archives from local directory by file id."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def download(self, id, output, quiet, use_cookies):  # noqa: A002
+        data = (self.directory / id).read_bytes()
+        if isinstance(output, str):
+            path = Path(output) / id
+            path.write_bytes(data)
+            return str(path)
+        for start in range(0, len(data), 4096):
+            output.write(data[start : start + 4096])
+        return output
+
+
+def _make_tar(path, names, mode="w:gz"):
+    with tarfile.open(path, mode) as tar:
+        for name in names:
+            info = tarfile.TarInfo(name)
+            info.size = len(CONTENT)
+            tar.addfile(info, io.BytesIO(CONTENT))
+    return path
+
+
+@pytest.fixture
+def local_gdown(tmp_path, monkeypatch):
+    (tmp_path / "served").mkdir()
+    gdown = _LocalGdown(tmp_path / "served")
+    monkeypatch.setattr(drives, "_require", lambda module, backend: gdown)
+    return gdown
+
+
+@pytest.mark.parametrize("compression", ["gz", "bz2", "xz"])
+def test_download_and_unpack_streams_tar(tmp_path, local_gdown, compression):
+    names = [f"dir/file_{i}.txt" for i in range(20)]
+    name = f"data.tar.{compression}"
+    _make_tar(local_gdown.directory / name, names, mode=f"w:{compression}")
+    archive, extracted = drives.download_and_unpack(name, tmp_path, stream=True)
+
+    assert archive is None
+    assert extracted == tmp_path / "data"
+    assert all((extracted / name).read_bytes() == CONTENT for name in names)
+    assert not (tmp_path / name).exists()
+
+
+def test_download_and_unpack_stream_rejects_path_traversal(tmp_path, local_gdown):
+    _make_tar(local_gdown.directory / "evil.tar", ["ok.txt", "../evil.txt"], mode="w")
+    with pytest.raises(ValueError, match="Unsafe TAR member path"):
+        drives.download_and_unpack("evil.tar", tmp_path, stream=True)
+
+    assert not (tmp_path / "evil.txt").exists()
+
+
+@pytest.mark.parametrize("compression", ["gz", "bz2", "xz"])
+def test_download_and_unpack_unpacks_downloaded_tar(tmp_path, local_gdown, compression):
+    name = f"data.tar.{compression}"
+    _make_tar(local_gdown.directory / name, ["file.txt"], mode=f"w:{compression}")
+    archive, extracted = drives.download_and_unpack(name, tmp_path, quiet=True)
+
+    assert archive == tmp_path / name
+    assert (extracted / "file.txt").read_bytes() == CONTENT
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_download_and_unpack_uses_cache(tmp_path, local_gdown, monkeypatch, stream):
+    _make_tar(local_gdown.directory / "data.tar.gz", ["file.txt"])
+    cache = drives.DriveCache(tmp_path / "cache")
+    _, extracted = drives.download_and_unpack("data.tar.gz", cache=cache, stream=stream)
+    assert (extracted / "file.txt").read_bytes() == CONTENT
+
+    monkeypatch.setattr(local_gdown, "download", None)  # network must not be touched
+    _, cached = drives.download_and_unpack("data.tar.gz", cache=cache, stream=stream)
+    assert cached == extracted
+
+    (extracted / "file.txt").write_bytes(b"corrupted")
+    assert cache.lookup(drives.DriveBackend.Google, "data.tar.gz") is None
+
+
+def test_drive_cache_evicts_least_recently_used(tmp_path, local_gdown):
+    for name in ("a", "b", "c"):
+        _make_tar(local_gdown.directory / f"{name}.tar", [name], mode="w")
+    cache = drives.DriveCache(tmp_path / "cache", max_size=2.5 * len(CONTENT), units="b")
+
+    drives.download_and_unpack("a.tar", cache=cache, quiet=True)
+    drives.download_and_unpack("b.tar", cache=cache, quiet=True)
+    drives.download_and_unpack("a.tar", cache=cache, quiet=True)  # "b" is the oldest now
+    drives.download_and_unpack("c.tar", cache=cache, quiet=True)
+
+    google = drives.DriveBackend.Google
+    assert cache.lookup(google, "a.tar") is not None
+    assert cache.lookup(google, "b.tar") is None
+    assert cache.lookup(google, "c.tar") is not None
+
+
+def test_download_and_unpack_overwrites_extract_dir(tmp_path, local_gdown):
+    _make_tar(local_gdown.directory / "data.tar", ["file.txt"], mode="w")
+    _, extracted = drives.download_and_unpack("data.tar", tmp_path, quiet=True)
+    (extracted / "stale.txt").write_bytes(b"stale")
+
+    with pytest.raises(FileExistsError):
+        drives.download_and_unpack("data.tar", tmp_path, quiet=True)
+
+    drives.download_and_unpack("data.tar", tmp_path, quiet=True, overwrite_extract_dir=True)
+    assert sorted(path.name for path in extracted.iterdir()) == ["file.txt"]
+
+
+def test_failed_background_cleanup_warns(tmp_path):
+    removal = Future()
+    removal.set_exception(PermissionError("denied"))
+    with pytest.warns(RuntimeWarning, match="trash"):
+        drives._warn_failed_cleanup(tmp_path / "data", removal)
+
+
+def test_zstd_requires_backend(tmp_path, monkeypatch):
+    import_module = importlib.import_module
+
+    def without_zstd(name):
+        if name in {"compression.zstd", "zstandard"}:
+            raise ImportError(name)
+        return import_module(name)
+
+    monkeypatch.setattr(importlib, "import_module", without_zstd)
+    with pytest.raises(ImportError, match="zstandard"):
+        drives._decompressed(io.BytesIO(drives._ZSTD_MAGIC + b"rest"))
+    with pytest.raises(ImportError, match="zstandard"):
+        list(sp_io.iter_jsonl(tmp_path / "data.jsonl.zst"))
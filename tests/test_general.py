@@ -0,0 +1,347 @@
+import asyncio
+import hashlib
+import threading
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from inspect import isasyncgenfunction, iscoroutinefunction, isgeneratorfunction
+from pathlib import Path
+from typing import ClassVar
+
+import numpy as np
+import pytest
+
+from somepytools.general import (
+    cp,
+    daterange,
+    dir_size,
+    download_url,
+    download_urls,
+    rm_r,
+    str2pathlib,
+    sync_dir,
+)
+
+
+@str2pathlib
+def _paths(first: Path, second: int = 0, third: Path = "default", *, fourth: Path = "kw"):
+    return first, second, third, fourth
+
+
+def test_str2pathlib_converts_args_kwargs_and_defaults():
+    assert _paths("a") == (Path("a"), 0, Path("default"), Path("kw"))
+    assert _paths("a", 1, "b", fourth="c") == (Path("a"), 1, Path("b"), Path("c"))
+    assert _paths(first="a", third=None) == (Path("a"), 0, None, Path("kw"))
+
+
+def test_str2pathlib_passes_paths_through():
+    first = Path("a")
+    assert _paths(first)[0] is first
+
+
+def test_str2pathlib_returns_function_without_path_args():
+    def no_paths(x: int, y: str):
+        return x, y
+
+    assert str2pathlib(no_paths) is no_paths
+
+
+def test_str2pathlib_keeps_function_kind():
+    @str2pathlib
+    def gen(path: Path):
+        sent = yield path
+        yield sent
+
+    @str2pathlib
+    async def coro(path: Path):
+        return path
+
+    @str2pathlib
+    async def agen(path: Path):
+        yield path
+
+    assert isgeneratorfunction(gen)
+    assert iscoroutinefunction(coro)
+    assert isasyncgenfunction(agen)
+
+    generator = gen("a")
+    assert next(generator) == Path("a")
+    assert generator.send("b") == "b"
+    assert asyncio.run(coro("a")) == Path("a")
+
+    async def collect():
+        return [item async for item in agen("a")]
+
+    assert asyncio.run(collect()) == [Path("a")]
+
+
+PAYLOAD = bytes(range(256)) * 1000
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    """Serves `PAYLOAD` supporting `Range: bytes=<start>-` requests.
+
+    `/missing*` paths respond with 404, `/flaky*` ones fail with 503 on the first request.
+    """
+
+    protocol_version = "HTTP/1.1"
+    flaky_seen: ClassVar[set[str]] = set()
+
+    def _send_empty(self, code: int):
+        self.send_response(code)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        if self.path.startswith("/missing"):
+            self._send_empty(404)
+            return
+        if self.path.startswith("/flaky") and self.path not in self.flaky_seen:
+            self.flaky_seen.add(self.path)
+            self._send_empty(503)
+            return
+
+        start = 0
+        if range_header := self.headers.get("Range"):
+            start = int(range_header.removeprefix("bytes=").rstrip("-"))
+            if start >= len(PAYLOAD):
+                self._send_empty(416)
+                return
+            self.send_response(206)
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(PAYLOAD) - start))
+        self.end_headers()
+        self.wfile.write(PAYLOAD[start:])
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RangeHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_url_streams_and_verifies(server_url, tmp_path):
+    checksum = hashlib.sha256(PAYLOAD).hexdigest()
+    path = download_url(f"{server_url}/data.bin", tmp_path, checksum=checksum, chunk_size=1000)
+
+    assert path == tmp_path / "data.bin"
+    assert path.read_bytes() == PAYLOAD
+    assert not (tmp_path / "data.bin.part").exists()
+
+
+def test_download_url_resumes_part_file(server_url, tmp_path):
+    (tmp_path / "data.bin.part").write_bytes(PAYLOAD[:1234])
+    checksum = hashlib.sha256(PAYLOAD).hexdigest()
+    path = download_url(f"{server_url}/data.bin", tmp_path / "data.bin", checksum=checksum)
+
+    assert path.read_bytes() == PAYLOAD
+
+    (tmp_path / "full.bin.part").write_bytes(PAYLOAD)
+    assert download_url(f"{server_url}/full.bin", tmp_path).read_bytes() == PAYLOAD
+
+
+def test_download_url_rejects_bad_checksum(server_url, tmp_path):
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        download_url(f"{server_url}/data.bin", tmp_path, checksum="0" * 64)
+
+    assert not list(tmp_path.iterdir())
+
+
+def test_download_urls_collects_results_and_errors(server_url, tmp_path):
+    items = [(f"{server_url}/file_{i}.bin", tmp_path) for i in range(10)]
+    items += [(f"{server_url}/missing.bin", tmp_path), (f"{server_url}/flaky.bin", tmp_path)]
+    report = download_urls(items, max_workers=4, backoff=0.01)
+
+    assert [result.url for result in report.results] == [url for url, _ in items]
+    assert [result.url for result in report.failed] == [f"{server_url}/missing.bin"]
+    assert report.failed[0].attempts == 1
+    assert report.results[-1].ok
+    assert report.results[-1].attempts == 2  # noqa: PLR2004
+    assert all(result.path.read_bytes() == PAYLOAD for result in report.results if result.ok)
+    assert report.n_bytes == 11 * len(PAYLOAD)
+    assert report.bytes_per_second > 0
+    assert list(report.host_latency) == [server_url.removeprefix("http://")]
+
+
+def test_download_urls_does_not_retry_local_errors(server_url, tmp_path):
+    save_path = tmp_path / "missing_dir" / "data.bin"
+    report = download_urls([(f"{server_url}/data.bin", save_path)], backoff=10)
+    assert isinstance(report.failed[0].error, FileNotFoundError)
+    assert report.failed[0].attempts == 1
+
+
+def test_download_urls_uses_proxy_from_environment(server_url, tmp_path, monkeypatch):
+    monkeypatch.setenv("http_proxy", server_url)
+    monkeypatch.delenv("no_proxy", raising=False)
+    # the host doesn't resolve, so only the proxy can serve it
+    report = download_urls([("http://proxied.invalid/data.bin", tmp_path)], retries=0)
+    assert report.results[0].ok
+    assert (tmp_path / "data.bin").read_bytes() == PAYLOAD
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_dir_size_counts_every_file_once(tmp_path, workers):
+    root, outside = tmp_path / "root", tmp_path / "outside"
+    (root / "a" / "nested").mkdir(parents=True)
+    (root / "b").mkdir()
+    outside.mkdir()
+    (root / "top.bin").write_bytes(b"x" * 10)
+    (root / "a" / "nested" / "file.bin").write_bytes(b"x" * 100)
+    (root / "b" / "file.bin").write_bytes(b"x" * 1000)
+    (outside / "file.bin").write_bytes(b"x" * 10000)
+
+    (root / "b" / "hardlink.bin").hardlink_to(root / "b" / "file.bin")
+    (root / "a" / "loop").symlink_to(root)
+    (root / "a" / "outside").symlink_to(outside)
+    (root / "b" / "outside").symlink_to(outside)
+    (root / "b" / "outside_file.bin").symlink_to(outside / "file.bin")
+    (outside / "back").symlink_to(root)
+
+    assert dir_size(root, workers=workers) == 11110  # noqa: PLR2004
+    assert dir_size(root, "Kb", check_softlinks=False, workers=workers) == 1110 / 1024
+    # content reachable from several subdirectories is attributed to the first one visited
+    breakdown = dir_size(root, breakdown=True, workers=workers)
+    assert breakdown.keys() == {root, root / "a", root / "b"}
+    assert breakdown[root] == 10  # noqa: PLR2004
+    assert sum(breakdown.values()) == 11110  # noqa: PLR2004
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_dir_size_link_to_ancestor(tmp_path, workers):
+    root = tmp_path / "tree" / "root"
+    (root / "a").mkdir(parents=True)
+    (root / "file.bin").write_bytes(b"x" * 100)
+    (tmp_path / "tree" / "sibling.bin").write_bytes(b"x" * 10)
+    (root / "a" / "up").symlink_to(Path("..", ".."))
+
+    # the ancestor is walked as an external directory, but the root inside it is not
+    assert dir_size(root, workers=workers) == 110  # noqa: PLR2004
+    assert dir_size(root, check_softlinks=False, workers=workers) == 100  # noqa: PLR2004
+
+
+@pytest.mark.parametrize("checksum", [False, True])
+def test_sync_dir_copies_only_changed_files(tmp_path, checksum):
+    source, dest = tmp_path / "source", tmp_path / "dest"
+    (source / "nested").mkdir(parents=True)
+    (source / "same.bin").write_bytes(b"x" * 10)
+    (source / "nested" / "changed.bin").write_bytes(b"y" * 100)
+
+    report = sync_dir(source, dest, checksum=checksum)
+    assert (report.copied_files, report.copied_bytes) == (2, 110)
+    assert (dest / "nested" / "changed.bin").read_bytes() == b"y" * 100
+
+    (source / "nested" / "changed.bin").write_bytes(b"z" * 1000)
+    report = sync_dir(source, dest, checksum=checksum)
+    assert (report.copied_files, report.copied_bytes) == (1, 1000)
+    assert (report.skipped_files, report.skipped_bytes) == (1, 10)
+    assert (dest / "nested" / "changed.bin").read_bytes() == b"z" * 1000
+
+    assert cp(str(source), str(dest), incremental=True) == dest
+
+
+def test_sync_dir_follows_symlinks_without_cycles(tmp_path):
+    source, dest, outside = tmp_path / "source", tmp_path / "dest", tmp_path / "outside"
+    (source / "a").mkdir(parents=True)
+    outside.mkdir()
+    (outside / "file.bin").write_bytes(b"x")
+    (source / "a" / "up").symlink_to("..")
+    (source / "a" / "outside").symlink_to(outside)
+    (outside / "back").symlink_to(source)
+
+    report = sync_dir(source, dest)
+    assert report.copied_files == 1
+    assert (dest / "a" / "outside" / "file.bin").read_bytes() == b"x"
+    assert (dest / "a" / "up").readlink() == Path("..")
+    assert (dest / "a" / "outside" / "back").is_symlink()
+    assert sync_dir(source, dest).skipped_files == 1
+
+
+def test_sync_dir_keeps_links_above_source(tmp_path):
+    source, dest = tmp_path / "tree" / "source", tmp_path / "tree" / "dest"
+    (source / "a").mkdir(parents=True)
+    (source / "a" / "file.bin").write_bytes(b"x")
+    (source / "a" / "up").symlink_to(Path("..", ".."))
+    (source / "a" / "dest").symlink_to(dest)
+
+    report = sync_dir(source, dest)
+    assert report.copied_files == 1
+    assert (dest / "a" / "up").readlink() == Path("..", "..")
+    assert (dest / "a" / "dest").readlink() == dest
+    assert sorted(path.name for path in dest.rglob("*")) == ["a", "dest", "file.bin", "up"]
+
+
+def _make_tree(root, width=5, depth=3):
+    for i in range(width):
+        (root / f"file_{i}").write_bytes(b"x")
+        if depth:
+            (root / f"dir_{i}").mkdir(parents=True)
+            _make_tree(root / f"dir_{i}", width, depth - 1)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_rm_r(tmp_path, workers):
+    folder = tmp_path / "folder"
+    folder.mkdir()
+    _make_tree(folder)
+    assert rm_r(folder, workers=workers) is None
+    assert not list(tmp_path.iterdir())
+
+    folder.mkdir()
+    _make_tree(folder)
+    future = rm_r(str(folder), background=True, workers=workers)
+    assert not folder.exists()
+    assert future.result(timeout=10) is None
+    assert not list(tmp_path.iterdir())
+
+    assert rm_r(folder, background=True).done()
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_rm_r_rejects_symlink(tmp_path, background):
+    (tmp_path / "target").mkdir()
+    (tmp_path / "target" / "file").write_bytes(b"x")
+    (tmp_path / "link").symlink_to(tmp_path / "target")
+
+    with pytest.raises(OSError, match="symbolic link"):
+        rm_r(tmp_path / "link", background=background, workers=4)
+    assert (tmp_path / "target" / "file").exists()
+    assert (tmp_path / "link").is_symlink()
+
+
+def test_daterange_is_lazy_sequence():
+    dates = daterange("2020-01-01", "2023-01-01")
+    assert len(dates) == 1096  # noqa: PLR2004
+    assert list(dates[:3]) == [date(2020, 1, 1), date(2020, 1, 2), date(2020, 1, 3)]
+    assert dates[-1] == date(2022, 12, 31)
+    assert date(2021, 6, 1) in dates
+    assert date(2023, 1, 1) not in dates
+    assert dates.index(date(2020, 1, 11)) == 10  # noqa: PLR2004
+    assert list(reversed(dates[:2])) == [date(2020, 1, 2), date(2020, 1, 1)]
+    assert dates[::7][1] == date(2020, 1, 8)
+    assert list(daterange("2020-01-01", "2020-01-03", include_last=True)) == [
+        date(2020, 1, 1),
+        date(2020, 1, 2),
+        date(2020, 1, 3),
+    ]
+
+
+def test_daterange_steps_and_numpy_export():
+    hours = daterange(datetime(2020, 1, 1), "2020-01-02", step="6h")
+    assert list(hours) == [datetime(2020, 1, 1, h) for h in (0, 6, 12, 18)]
+    assert datetime(2020, 1, 1, 6) in hours
+    assert datetime(2020, 1, 1, 7) not in hours
+    assert hours.to_numpy().tolist() == list(hours)
+
+    weeks = daterange("2020-01-29", "2020-01-01", step=-7)
+    assert list(weeks.to_numpy()) == [np.datetime64(d, "D") for d in weeks]
+    assert weeks.to_numpy().dtype == np.dtype("datetime64[D]")
+
+    with pytest.raises(ValueError, match="whole number of days"):
+        daterange("2020-01-01", "2020-01-02", step="1h")
@@ -0,0 +1,137 @@
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from somepytools import image  # noqa: E402
+from somepytools.boxes import Boxes  # noqa: E402
+
+
+@pytest.fixture
+def images():
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 255, (60, 80, 3), dtype=np.uint8) for _ in range(9)]
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_resize_batch(images, workers):
+    expected = np.stack([image.resize(item, height=30) for item in images])
+
+    batch = image.resize_batch(images, height=30, workers=workers)
+    np.testing.assert_array_equal(batch, expected)
+
+    stacked = image.resize_batch(np.stack(images), height=30, out=batch, workers=workers)
+    assert stacked is batch
+    np.testing.assert_array_equal(stacked, expected)
+
+
+def test_resize_keeps_nearest_interpolation(images):
+    expected = cv2.resize(images[0], (40, 30), interpolation=cv2.INTER_NEAREST)
+    resized = image.resize(images[0], cv2.INTER_NEAREST, height=30)
+    np.testing.assert_array_equal(resized, expected)
+    batch = image.resize_batch(images, cv2.INTER_NEAREST, height=30, workers=1)
+    np.testing.assert_array_equal(batch[0], expected)
+
+
+def test_resize_batch_validation(images):
+    with pytest.raises(ValueError, match="aspect ratios"):
+        image.resize_batch([*images, images[0][:, :40]], height=30)
+    image.resize_batch([*images, images[0][:, :40]], height=30, width=40)
+
+    with pytest.raises(ValueError, match="channels"):
+        image.resize_batch([*images, images[0][..., 0]], height=30, width=40)
+    with pytest.raises(ValueError, match="`out`"):
+        image.resize_batch(images, height=30, out=np.empty((9, 30, 40, 3), np.float32))
+
+
+@pytest.fixture
+def image_dir(tmp_path):
+    rng = np.random.default_rng(0)
+    base = cv2.resize(rng.integers(0, 255, (12, 16, 3), dtype=np.uint8), (640, 480))
+    for i in range(4):
+        cv2.imwrite((tmp_path / f"{i}.jpg").as_posix(), np.roll(base, 40 * i, axis=1))
+    cv2.imwrite((tmp_path / "4.png").as_posix(), base)
+    (tmp_path / "notes.txt").write_text("not an image")
+    return tmp_path
+
+
+def test_jpeg_size_and_reduction(image_dir):
+    assert image._jpeg_size(image_dir / "0.jpg") == (480, 640)
+    assert image._jpeg_size(image_dir / "4.png") is None
+    assert image._reduction((480, 640), (60, 60)) == 8  # noqa: PLR2004
+    assert image._reduction((480, 640), (200, 100)) == 2  # noqa: PLR2004
+    assert image._reduction((480, 640), (320, 240)) == 1
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_read_images(image_dir, workers):
+    paths = sorted(image_dir.glob("*.[jp][pn]g"))
+    full = [cv2.imread(path.as_posix())[..., ::-1] for path in paths]
+    expected = np.stack([image.resize(item, height=60) for item in full]).astype(float)
+
+    loaded = image.read_images(image_dir, height=60, workers=workers)
+    assert loaded.shape == (5, 60, 80, 3)
+    assert np.abs(loaded - expected).mean() < 3  # noqa: PLR2004
+
+    bgr = image.read_images(paths, height=60, opencv_format=True, workers=workers)
+    np.testing.assert_array_equal(bgr, loaded[..., ::-1])
+
+    np.testing.assert_array_equal(image.read_images(paths[:2], workers=workers), full[:2])
+    np.testing.assert_array_equal(image.read_images(str(paths[1])), full[1:2])
+
+
+def test_read_image_errors(image_dir):
+    with pytest.raises(ValueError, match="Can't read"):
+        image.read_image(image_dir / "notes.txt")
+    with pytest.raises(ValueError, match="No images"):
+        image.read_images([])
+    with pytest.raises(FileNotFoundError, match="missing"):
+        image.read_images(str(image_dir / "missing"))
+    tall = image_dir / "tall.bmp"
+    cv2.imwrite(tall.as_posix(), np.zeros((100, 50, 3), np.uint8))
+    with pytest.raises(ValueError, match="resized to"):
+        image.read_images([image_dir / "0.jpg", tall], width=100)
+
+
+@pytest.fixture
+def pyplot(monkeypatch):
+    matplotlib = pytest.importorskip("matplotlib")
+    matplotlib.use("Agg")
+    plt = pytest.importorskip("matplotlib.pyplot")
+    monkeypatch.setattr(plt, "show", lambda: None)
+    yield plt
+    plt.close("all")
+
+
+def test_plot_image_scales(pyplot):
+    rng = np.random.default_rng(0)
+    big = rng.integers(0, 255, (3000, 8000, 3), dtype=np.uint8)
+    top_left = rng.uniform(0, 7000, (5000, 2))
+    boxes = np.concatenate([top_left, top_left + 50], axis=1)
+
+    image.plot_image(big, boxes=boxes, figsize=(10, 4))
+    ax = pyplot.gca()
+    shown = ax.images[0].get_array()
+    assert shown.shape[0] <= 4 * pyplot.gcf().dpi
+    assert ax.images[0].get_extent() == [-0.5, 7999.5, 2999.5, -0.5]
+    assert not ax.patches
+    (outlines,) = ax.collections
+    assert len(outlines.get_segments()) == len(boxes)
+    np.testing.assert_array_equal(outlines.get_segments()[0][2], boxes[0, 2:])
+
+
+def test_plot_images_grid(pyplot, images):
+    masks = [item[..., 0] > 128 for item in images[:2]]  # noqa: PLR2004
+    image.plot_images(
+        [*images[:3], *masks],
+        titles=list("abcde"),
+        boxes=[*[[[1, 2, 10, 20]]] * 4, Boxes([[1, 2, 9, 18]], "xywh")],
+        ncols=3,
+        figsize=(1.5, 1),
+    )
+    axes = pyplot.gcf().axes
+    assert len(axes) == 6  # noqa: PLR2004
+    assert [ax.get_title() for ax in axes[:5]] == list("abcde")
+    assert all(len(ax.collections) == 1 for ax in axes[:5])
+    np.testing.assert_array_equal(axes[4].collections[0].get_segments()[0][2], [10, 20])
+    assert not axes[5].images
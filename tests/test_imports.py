@@ -0,0 +1,55 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parents[1]
+HEAVY = {"torch", "cv2", "numpy", "yaml", "toml", "matplotlib", "polars"}
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Returns cumulative import time in microseconds of every module loaded by `module`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize(
+    ("module", "allowed"),
+    [
+        ("constants", set()),
+        ("typing", set()),
+        ("general", set()),
+        ("io", set()),
+        ("drives", set()),
+        ("boxes", {"numpy"}),
+        ("image", {"cv2", "numpy"}),
+        ("video", {"cv2", "numpy"}),
+    ],
+)
+def test_heavy_modules_are_lazy(module, allowed):
+    times = import_times(f"somepytools.{module}")
+    loaded = {name.partition(".")[0] for name in times} & (HEAVY - allowed)
+    total_ms = times[f"somepytools.{module}"] / 1e3
+    assert not loaded, f"somepytools.{module} ({total_ms:.0f} ms) imports {loaded}"
+
+
+def test_lazy_types():
+    code = (
+        "import sys, numpy; from somepytools import typing;"
+        "assert 'torch' not in sys.modules; assert typing.Array is numpy.ndarray;"
+        "assert 'Tensor' in dir(typing); typing.Tensor"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
@@ -0,0 +1,175 @@
+import gzip
+import json
+import math
+
+import pytest
+
+from somepytools import io
+
+DATA = {
+    "name": "config",
+    "values": [1, 2.5, None, True, "строка"],
+    "nested": {"list": [{"a": 1}, {"b": [1, 2, 3]}], "empty": {}},
+}
+
+
+@pytest.mark.parametrize("backend", ["auto", *io._JSON_DECODERS])
+def test_json_backends_read_identically(tmp_path, backend):
+    path = io.write_json(DATA, tmp_path / "data")
+    assert io.read_json(path, backend=backend) == DATA
+
+    path.write_text('{"nan": NaN, "big": 123456789012345678901234567890}')
+    assert io.read_json(path, backend=backend) == io.read_json(path, backend="json")
+
+
+class _StrictDecodeError(Exception):
+    """Like ``DecodeError`` of older msgspec versions, not a ``ValueError``."""
+
+
+def _strict_decode(content: bytes):
+    if b"NaN" in content:
+        raise _StrictDecodeError
+    return io.json.loads(content)
+
+
+def test_json_fallback_catches_backend_error(tmp_path, monkeypatch):
+    monkeypatch.setitem(io._JSON_DECODERS, "strict", _strict_decode)
+    monkeypatch.setitem(io._JSON_DECODE_ERRORS, "strict", _StrictDecodeError)
+    path = tmp_path / "data.json"
+    path.write_text('{"nan": NaN}\n{"a": 1}\n')
+
+    assert list(io.iter_jsonl(path, backend="strict"))[1] == {"a": 1}
+    path.write_text('{"nan": NaN}')
+    assert io.read_json(path, backend="strict").keys() == {"nan"}
+
+
+@pytest.mark.parametrize("backend", ["auto", *io._JSON_ENCODERS])
+def test_json_backends_write(tmp_path, backend):
+    path = io.write_json(DATA, tmp_path / "data.json", backend=backend, newline=True)
+    assert io.read_json(path, backend="json") == DATA
+    assert path.read_text().endswith("}\n")
+
+
+def test_json_backend_validation(tmp_path):
+    path = io.write_json(DATA, tmp_path / "data.json")
+    with pytest.raises(ValueError, match="not available"):
+        io.read_json(path, backend="unknown")
+    with pytest.raises(ValueError, match="not supported"):
+        io.read_json(path, backend="orjson", parse_int=str)
+
+
+# yaml backends are known only after its import
+_YAML_LOADERS = io._yaml_backends()[1] if hasattr(io, "_yaml_backends") else {}
+
+
+@pytest.mark.parametrize("backend", ["auto", *_YAML_LOADERS])
+def test_yaml_backends_identical(tmp_path, backend):
+    pytest.importorskip("yaml")
+    path = io.write_yaml(DATA, tmp_path / "data.yaml", backend=backend)
+    reference = io.write_yaml(DATA, tmp_path / "reference.yaml", backend="pyyaml")
+
+    assert path.read_text() == reference.read_text()
+    assert io.read_yaml(path, backend=backend) == DATA
+
+
+@pytest.mark.parametrize("backend", ["auto", *io._TOML_LOADERS])
+def test_toml_backends_identical(tmp_path, backend):
+    path = tmp_path / "data.toml"
+    path.write_text('title = "x"\n[table]\nvalues = [1, 2]\nnested = { a = 1.5 }\n')
+
+    assert io.read_toml(path, backend=backend) == {
+        "title": "x",
+        "table": {"values": [1, 2], "nested": {"a": 1.5}},
+    }
+
+
+def test_parse_cache(tmp_path):
+    path = io.write_json(DATA, tmp_path / "data.json")
+    cache = io.ParseCache()
+
+    first = io.read_json(path, cache=cache)
+    first["nested"]["list"].append("mutated")
+    assert io.read_json(path, cache=cache) == DATA
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+    io.write_json({"changed": True, "padding": "x" * 100}, path)
+    assert io.read_json(path, cache=cache) == {"changed": True, "padding": "x" * 100}
+    assert cache.stats()["misses"] == 2  # noqa: PLR2004
+
+
+def test_parse_cache_immutable_and_bounded(tmp_path):
+    cache = io.ParseCache(max_size=1, units="Kb", immutable=True)
+    path = io.write_json(DATA, tmp_path / "data.json")
+
+    frozen = io.read_json(path, cache=cache)
+    assert frozen is io.read_json(path, cache=cache)
+    assert frozen["nested"]["list"][1]["b"] == (1, 2, 3)
+    with pytest.raises(TypeError):
+        frozen["name"] = "other"
+
+    big = io.write_json({"data": "x" * 600}, tmp_path / "big.json")
+    io.read_json(big, cache=cache)
+    io.read_json(big.rename(tmp_path / "big2.json"), cache=cache)
+    stats = cache.stats()
+    assert stats["evictions"] >= 1
+    assert stats["size"] <= 1024  # noqa: PLR2004
+
+
+def _compressions():
+    suffixes = [".jsonl", ".jsonl.gz"]
+    for module in ("compression.zstd", "zstandard"):
+        try:
+            __import__(module)
+            return [*suffixes, ".jsonl.zst"]
+        except ImportError:
+            pass
+    return suffixes
+
+
+@pytest.mark.parametrize("suffix", _compressions())
+@pytest.mark.parametrize("backend", ["auto", *io._JSON_ENCODERS])
+def test_jsonl_roundtrip(tmp_path, suffix, backend):
+    records = ({"id": i, "value": DATA["values"]} for i in range(25))
+    path = io.write_jsonl(records, tmp_path / f"data{suffix}", backend=backend, batch_size=10)
+
+    restored = io.iter_jsonl(path, backend=backend)
+    assert not isinstance(restored, list)
+    assert list(restored) == [{"id": i, "value": DATA["values"]} for i in range(25)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1 << 16])
+def test_iter_json_array(tmp_path, chunk_size):
+    items = [12345, -1.5e10, "строка, ]", True, None, [], {}, DATA, [[1], {"a": [2]}]]
+    path = io.write_json(items, tmp_path / "data.json", indent=2)
+    assert list(io.iter_json_array(path, chunk_size=chunk_size)) == items
+
+    path = tmp_path / "empty.json.gz"
+    path.write_bytes(gzip.compress(b" [ ]\n"))
+    assert list(io.iter_json_array(path, chunk_size=chunk_size)) == []
+
+
+@pytest.mark.parametrize("content", ['{"a": 1}', "[1, 2", "[1 2]", "[1, 2] 3", "[1,]"])
+def test_iter_json_array_invalid(tmp_path, content):
+    path = tmp_path / "data.json"
+    path.write_text(content)
+    with pytest.raises(ValueError):
+        list(io.iter_json_array(path, chunk_size=2))
+
+
+@pytest.mark.parametrize("chunk_size", range(1, 10))
+def test_iter_json_array_cut_tokens(tmp_path, chunk_size):
+    path = tmp_path / "data.json"
+    path.write_text('[1.5e3, -Infinity, "\\u00e9", 2]')
+    assert list(io.iter_json_array(path, chunk_size=chunk_size)) == [1.5e3, -math.inf, "é", 2]
+
+
+def test_iter_json_array_error_position(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text('[\n  "first",\n  {"a" 1},\n' + "  2,\n" * 100_000 + "  3\n]")
+    with pytest.raises(json.JSONDecodeError) as info:
+        list(io.iter_json_array(path, chunk_size=16))
+    assert (info.value.pos, info.value.lineno, info.value.colno) == (20, 3, 8)
+    assert "line 3 column 8 (char 20)" in str(info.value)
+    # malformed element is reported without reading the rest of the file
+    assert len(info.value.doc) < 100  # noqa: PLR2004
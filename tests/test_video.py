@@ -0,0 +1,273 @@
+import contextlib
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from somepytools import video  # noqa: E402
+
+N_FRAMES = 12
+HEIGHT, WIDTH = 48, 64
+
+
+@pytest.fixture(scope="module")
+def video_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("video") / "clip.avi"
+    fourcc = cv2.VideoWriter_fourcc(*"MJPG")
+    writer = cv2.VideoWriter(path.as_posix(), fourcc, 10, (WIDTH, HEIGHT))
+    for i in range(N_FRAMES):
+        frame = np.zeros((HEIGHT, WIDTH, 3), np.uint8)
+        frame[:, :, 0] = 200  # blue in BGR
+        frame[: 4 * (i + 1)] = 255
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+def prefetch_threads():
+    return [t for t in threading.enumerate() if t.name == "somepytools-prefetch"]
+
+
+@pytest.mark.parametrize("prefetch", [0, 1, 4])
+def test_frames(video_path, prefetch):
+    rgb = list(video.frames(video_path, prefetch=prefetch))
+    bgr = list(video.frames(video_path, rgb=False, prefetch=prefetch))
+
+    assert len(rgb) == N_FRAMES
+    assert all(frame.flags.c_contiguous for frame in rgb)
+    assert rgb[0].shape == (HEIGHT, WIDTH, 3)
+    for rgb_frame, bgr_frame in zip(rgb, bgr, strict=True):
+        np.testing.assert_array_equal(rgb_frame, bgr_frame[:, :, ::-1])
+
+
+def test_frames_prefetch_early_stop(video_path):
+    stream = video.frames(video_path, prefetch=2)
+    next(stream)
+    stream.close()
+    assert not prefetch_threads()
+
+
+def test_frames_prefetch_error():
+    class BrokenCapture:
+        calls = 0
+
+        def read(self):
+            self.calls += 1
+            if self.calls > 3:  # noqa: PLR2004
+                raise RuntimeError("decoder failure")
+            return True, np.zeros((2, 2, 3), np.uint8)
+
+    stream = video.frames(BrokenCapture(), prefetch=2)
+    with pytest.raises(RuntimeError, match="decoder failure"):
+        list(stream)
+    assert not prefetch_threads()
+
+
+@pytest.mark.parametrize("step", [1, 3])
+@pytest.mark.parametrize("dtype", [None, np.float32])
+def test_frame_batches(video_path, step, dtype):
+    expected = np.stack(list(video.frames(video_path)))[::step]
+    batches, buffers = [], set()
+    for batch in video.frame_batches(video_path, 5, step=step, dtype=dtype):
+        buffers.add(batch.ctypes.data)
+        batches.append(batch.copy())
+
+    assert len(buffers) == 1
+    assert batches[0].dtype == (dtype or np.uint8)
+    assert [len(batch) for batch in batches[:-1]] == [5] * (len(batches) - 1)
+    np.testing.assert_array_equal(np.concatenate(batches), expected)
+
+
+def test_frame_batches_skips_with_grab():
+    class Capture:
+        reads = grabs = 0
+
+        def read(self, image=None):
+            self.reads += 1
+            frame = np.zeros((2, 2, 3), np.uint8) if image is None else image
+            return self.reads + self.grabs <= N_FRAMES, frame
+
+        def grab(self):
+            self.grabs += 1
+            return self.reads + self.grabs <= N_FRAMES
+
+    capture = Capture()
+    batches = list(video.frame_batches(capture, 2, step=4))
+    assert sum(map(len, batches)) == N_FRAMES // 4
+    assert capture.reads == N_FRAMES // 4 + 1  # the last one hits the end of video
+
+
+@pytest.mark.parametrize("step", [0, -2])
+def test_frame_batches_rejects_step(video_path, step):
+    with pytest.raises(ValueError, match="step"):
+        next(video.frame_batches(video_path, step=step))
+
+
+@pytest.fixture(scope="module")
+def gop_video_path(tmp_path_factory):
+    """Video with inter frames (keyframe every 12 frames)."""
+    path = tmp_path_factory.mktemp("video") / "clip.mp4"
+    writer = cv2.VideoWriter(path.as_posix(), cv2.VideoWriter_fourcc(*"mp4v"), 25, (64, 48))
+    for i in range(60):
+        frame = np.full((48, 64, 3), i * 4, np.uint8)
+        frame[:8, i] = 255
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+def test_frame_index_cache(gop_video_path, monkeypatch):
+    index = video.frame_index(gop_video_path)
+    assert len(index) == 60  # noqa: PLR2004
+    assert index.keyframes[0] == 0
+    assert 1 < len(index.keyframes) < len(index)
+    assert np.all(np.diff(index.timestamps) > 0)
+
+    def scan(video_path):
+        raise AssertionError("index should be taken from cache")
+
+    monkeypatch.setattr(video, "_scan_frames", scan)
+    cached = video.frame_index(gop_video_path)
+    np.testing.assert_array_equal(cached.keyframes, index.keyframes)
+
+    stat_result = gop_video_path.stat()
+    os.utime(gop_video_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10**9))
+    with pytest.raises(AssertionError, match="from cache"):
+        video.frame_index(gop_video_path)
+
+
+def test_indexed_video(gop_video_path):
+    expected = list(video.frames(gop_video_path))
+    requested = [59, 3, 30, 31, 3, -1, 0, 25, 13]
+
+    with video.IndexedVideo(gop_video_path, cache=False) as indexed:
+        assert len(indexed) == len(expected)
+        for frame, image in zip(requested, indexed.get_frames(requested), strict=True):
+            np.testing.assert_array_equal(image, expected[frame])
+        np.testing.assert_array_equal(indexed.get_frame(44), expected[44])
+        with pytest.raises(IndexError):
+            indexed.get_frame(len(expected))
+
+
+def test_indexed_video_imprecise_seek(gop_video_path):
+    class ImpreciseCapture:
+        def __init__(self, capture):
+            self.capture = capture
+
+        def set(self, prop, value):
+            return self.capture.set(prop, value + 1)
+
+        def __getattr__(self, name):
+            return getattr(self.capture, name)
+
+    expected = list(video.frames(gop_video_path))
+    with video.IndexedVideo(gop_video_path, cache=False) as indexed:
+        indexed._capture = ImpreciseCapture(indexed._capture)
+        np.testing.assert_array_equal(indexed.get_frame(50), expected[50])
+        assert not indexed._seekable
+        np.testing.assert_array_equal(indexed.get_frame(10), expected[10])
+
+
+def test_get_meta_counts_without_decoding(video_path, monkeypatch):
+    def decode(*args, **kwargs):
+        raise AssertionError("frames shouldn't be decoded")
+
+    monkeypatch.setattr(video, "frames", decode)
+    meta = video.get_meta(video_path)
+    assert meta["frame_count"] == N_FRAMES
+    assert (meta["width"], meta["height"]) == (WIDTH, HEIGHT)
+    assert video.get_meta(video_path, count_frames=False)["frame_count"] is None
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_collect_meta(video_path, gop_video_path, tmp_path, workers):
+    for path in (video_path, gop_video_path):
+        (tmp_path / "nested").mkdir(exist_ok=True)
+        (tmp_path / "nested" / path.name).symlink_to(path)
+    (tmp_path / "broken.mp4").write_bytes(b"not a video")
+    (tmp_path / "notes.txt").write_text("not a video")
+
+    table = video.collect_meta(tmp_path, workers=workers)
+    names = [Path(path).name for path in table["path"]]
+    assert names == ["broken.mp4", "clip.avi", "clip.mp4"]
+    assert list(table["frame_count"]) == [-1, N_FRAMES, 60]
+    assert table["error"][0]
+    assert np.isnan(table["width"][0])
+    assert list(table["width"][1:]) == [WIDTH, 64]
+
+
+def test_write_video_streaming(tmp_path):
+    def generate():
+        frame = np.zeros((HEIGHT, WIDTH, 3), np.uint8)
+        for i in range(N_FRAMES):
+            frame[:] = (200, 0, 0)  # red in RGB, buffer is reused by the producer
+            frame[:, : i + 1] = 0
+            yield frame
+
+    path = tmp_path / "written.avi"
+    video.write_video(generate(), path, "MJPG", fps=10)
+
+    written = list(video.frames(path))
+    assert len(written) == N_FRAMES
+    red, green, blue = written[0][:, -10:].reshape(-1, 3).mean(axis=0)
+    assert red > 150 > green + blue  # noqa: PLR2004
+    assert written[-1][:, : N_FRAMES - 2].mean() < written[0][:, : N_FRAMES - 2].mean()
+
+
+def test_video_writer_errors(tmp_path, monkeypatch):
+    frame = np.zeros((HEIGHT, WIDTH, 3), np.uint8)
+    with video.VideoWriter(tmp_path / "shape.avi", "MJPG") as writer:
+        writer.write(frame)
+        with pytest.raises(ValueError, match="shape"):
+            writer.write(frame[:10])
+    with pytest.raises(ValueError, match="closed"):
+        writer.write(frame)
+
+    class BrokenWriter:
+        def write(self, frame):
+            raise RuntimeError("encoder failure")
+
+    @contextlib.contextmanager
+    def open_broken(*args):
+        yield BrokenWriter()
+
+    monkeypatch.setattr(video, "open_video", open_broken)
+    writer = video.VideoWriter(tmp_path / "broken.avi", queue_size=2)
+    with pytest.raises(RuntimeError, match="encoder failure"):
+        for _ in range(10):
+            writer.write(frame)
+        writer.close()
+    writer.close()
+
+
+def mean_colour(frame):
+    return frame.mean(axis=(0, 1))
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_map_frames(gop_video_path, workers):
+    expected = [mean_colour(frame) for frame in video.frames(gop_video_path)]
+    results = video.map_frames(gop_video_path, mean_colour, workers, segment_size=7)
+    np.testing.assert_array_equal(np.stack(list(results)), np.stack(expected))
+
+
+def test_map_frames_indexes_video_once(gop_video_path, monkeypatch):
+    parent, scan_frames = os.getpid(), video._scan_frames
+
+    def scan_in_parent(path):
+        assert os.getpid() == parent, "worker rebuilt the frame index"
+        return scan_frames(path)
+
+    monkeypatch.setattr(video, "_scan_frames", scan_in_parent)
+    results = video.map_frames(gop_video_path, mean_colour, 2, segment_size=7, cache=False)
+    assert len(list(results)) == len(video.frame_index(gop_video_path, cache=False))
+
+
+def test_map_frames_early_stop(gop_video_path):
+    results = video.map_frames(gop_video_path, mean_colour, 2, segment_size=5)
+    assert len([result for _, result in zip(range(8), results, strict=False)]) == 8  # noqa: PLR2004
+    results.close()